@@ -0,0 +1,29 @@
+"""Optional compiled build of the checker hot path.
+
+Setting BQ_ANTIPATTERN_CHECKER_COMPILE=1 compiles antipatterns.py and functions.py
+with Cython in pure Python mode, removing interpreter overhead around the AST walks.
+The sources are unchanged, so without it the package builds and runs as plain Python.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("BQ_ANTIPATTERN_CHECKER_COMPILE") == "1":
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [
+            "src/bq_sql_antipattern_checker/antipatterns.py",
+            "src/bq_sql_antipattern_checker/functions.py",
+        ],
+        compiler_directives={
+            "language_level": "3",
+            "binding": True,
+            # Keep annotations as hints only, matching the pure Python behaviour
+            "annotation_typing": False,
+        },
+    )
+
+setup(ext_modules=ext_modules)
@@ -26,12 +26,176 @@ Example:
 """
 
 import datetime as dt
+import re
+from collections import defaultdict
+from itertools import chain
 from typing import Any
 
 from sqlglot import exp
 
 from bq_sql_antipattern_checker import functions
-from bq_sql_antipattern_checker.config import Config
+from bq_sql_antipattern_checker.config import Config, get_default_config
+
+# Every check that can be switched on or off in the antipatterns section of the config
+ANTIPATTERN_NAMES = (
+    "select_star",
+    "semi_join_without_aggregation",
+    "order_without_limit",
+    "regexp_in_where",
+    "like_before_more_selective",
+    "multiple_cte_reference",
+    "partition_not_used",
+    "big_date_range",
+    "big_table_no_date",
+    "unpartitioned_tables",
+    "distinct_on_big_table",
+    "count_distinct_on_big_table",
+)
+# REGEXP functions, LIKE is cheaper when it can express the same match
+_REGEXP_TYPES = (exp.RegexpLike, exp.RegexpReplace, exp.RegexpExtract)
+# Conditions that can't use BigQuery's pruning / are expensive to evaluate per row
+_LESS_SELECTIVE_TYPES = (exp.Like, *_REGEXP_TYPES)
+# Conditions that narrow rows down cheaply and should come first in a WHERE clause
+_MORE_SELECTIVE_TYPES = (exp.EQ, exp.NEQ, exp.GT, exp.GTE, exp.LT, exp.LTE, exp.In)
+# Comparisons in WHERE and JOIN clauses that can filter or bound a date column
+_DATE_COMPARISON_TYPES = (exp.Between, exp.GTE, exp.GT, exp.EQ)
+# Column names and cast types that look like a date, timestamp or partition column
+_DATE_LIKE_RE = re.compile(r"date|time|partition")
+# Clauses scanned for date comparisons, a clause nested in another is scanned on its own
+_CLAUSE_TYPES = (exp.Where, exp.Join)
+# Approximate number of days per date part, used to size date ranges
+_DAYS = {
+    "DAY": 1,
+    "WEEK": 7,
+    "ISOWEEK": 7,
+    "MONTH": 30,
+    "YEAR": 365,
+    "ISOYEAR": 365,
+    "MINUTE": 0.0007,
+    "HOUR": 0.04,
+    "QUARTER": 90,
+    "SECOND": 0.00001166666667,
+}
+# Date literals in ISO format, other literals compared to a date column are not sized
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _is_placeholder_condition(node: exp.Expression) -> bool:
+    """Check for "1=1" conditions, often used as a starter to chain AND filters"""
+    return (
+        isinstance(node, exp.EQ)
+        and isinstance(node.this, exp.Literal)
+        and isinstance(node.expression, exp.Literal)
+        and node.this.name == "1"
+        and node.expression.name == "1"
+    )
+
+
+def _date_cte_names(table: exp.Table) -> tuple[str | None, str | None]:
+    # need a way to find ctes used for date filteration
+    args = table.args
+    if args.get("db"):
+        return None, None
+    this = args.get("this")
+    return this.args.get("this") if this else None, functions.get_table_alias(table)
+
+
+def _days_since(date_exp: str, now: dt.datetime) -> int | None:
+    """Days between a literal starting with a YYYY-MM-DD date and now, None for other literals"""
+    if not _ISO_DATE_RE.match(date_exp):
+        return None
+    try:
+        return (now.date() - dt.date.fromisoformat(date_exp[:10])).days
+    except ValueError:
+        # Shaped like a date but not one, e.g. '2024-13-45'
+        return None
+
+
+def _enclosing_selects(nodes: list[exp.Expression]) -> set[int]:
+    """Ids of the selects with any of the nodes below them"""
+    selects: set[int] = set()
+    for node in nodes:
+        parent = node.parent
+        while parent is not None:
+            if isinstance(parent, exp.Select):
+                if id(parent) in selects:
+                    # The selects further up were marked along with this one
+                    break
+                selects.add(id(parent))
+            parent = parent.parent
+    return selects
+
+
+def _has_distinct(node: exp.Expression, index: functions.NodeIndex) -> bool:
+    """Check for a DISTINCT under a node from the statement's index rather than a walk"""
+    return any(functions.is_descendant(d, node) for d in index.get(exp.Distinct, []))
+
+
+def _scan_clause(
+    clause: exp.Expression, scanned: dict[int, tuple[list[exp.Expression], bool]]
+) -> tuple[list[exp.Expression], bool]:
+    """Collect a WHERE/JOIN clause's own date comparisons and whether it unnests an array
+    The walk stops at nested clauses, which are scanned once on their own and only pass their
+    unnests up, so each comparison is collected from the innermost clause around it
+    """
+    if id(clause) not in scanned:
+        comparisons: list[exp.Expression] = []
+        has_unnest = False
+        for node, *_ in clause.walk(
+            prune=lambda n, *_: n is not clause and isinstance(n, _CLAUSE_TYPES)
+        ):
+            if node is not clause and isinstance(node, _CLAUSE_TYPES):
+                has_unnest = _scan_clause(node, scanned)[1] or has_unnest
+            elif isinstance(node, _DATE_COMPARISON_TYPES):
+                comparisons.append(node)
+            elif isinstance(node, exp.Unnest):
+                has_unnest = True
+        scanned[id(clause)] = (comparisons, has_unnest)
+    return scanned[id(clause)]
+
+
+def _select_table_names(select: exp.Expression) -> list[tuple[str | None, str | None]]:
+    """The fully qualified name and the alias, where present, of each table in a select"""
+    names = []
+    for t in functions.iter_typed(select, exp.Table):
+        table_name = None
+        if t.args.get("catalog"):
+            table_name, _ = functions.get_alias_and_table_name_from_table(t)
+        alias_ref = t.args.get("alias")
+        # Rendering the alias identifier generates SQL, so it's done once per table
+        alias = str(alias_ref.args.get("this")) if alias_ref else None
+        names.append((table_name, alias))
+    return names
+
+
+def _record_select_tables(
+    select: exp.Expression,
+    column_name: str,
+    queried_tables: dict[str, dict[str, Any]],
+    tables_with_date_filter: set[str],
+    tables_without_date_filter: set[str],
+    *,
+    select_tables: dict[int, list[tuple[str | None, str | None]]] | None = None,
+) -> None:
+    """Record whether the fully qualified and aliased tables of a select have the date column
+    select_tables keeps each select's table names for the other comparisons of the statement
+    """
+    if select_tables is None:
+        select_tables = {}
+    if id(select) not in select_tables:
+        select_tables[id(select)] = _select_table_names(select)
+    for table_name, alias in select_tables[id(select)]:
+        if table_name in queried_tables:
+            if column_name in queried_tables[table_name]["available_datetime_columns_list"]:
+                tables_with_date_filter.add(table_name)
+            else:
+                tables_without_date_filter.add(table_name)
+        if alias in queried_tables:
+            full_table_name = queried_tables[alias]["full_table_name"]
+            if column_name in queried_tables[alias]["available_datetime_columns_list"]:
+                tables_with_date_filter.update((alias, full_table_name))
+            else:
+                tables_without_date_filter.update((alias, full_table_name))
 
 
 class Antipatterns:
@@ -50,38 +214,75 @@ class Antipatterns:
         >>> checker = Antipatterns(config)
     """
 
+    __slots__ = ("config", "enabled")
+
     def __init__(self, config: Config) -> None:
         """Initialize with configuration settings."""
         self.config = config
+        # Resolved once here rather than for every statement of every job
+        self.enabled = self.enabled_antipatterns(config)
 
-    def check_select_star(self, ast: exp.Expression) -> bool:
+    @staticmethod
+    def enabled_antipatterns(config: Config) -> frozenset[str]:
+        """Return the names of the antipattern checks enabled in the config."""
+        return frozenset(name for name in ANTIPATTERN_NAMES if config.is_antipattern_enabled(name))
+
+    def check_select_star(
+        self, ast: exp.Expression, index: functions.NodeIndex | None = None
+    ) -> bool:
         """Anti Pattern: Selecting all columns
         avoids select * from CTEs or sub queries.
         only looks at a direct from statement where there's dataset value in source table
         ignores cases where no select is found like "update set from"
         """
-        from_statements = ast.find_all(exp.From)
-
+        if index is None:
+            index = functions.index_ast(ast)
+        from_statements = index.get(exp.From, [])
+
+        # The selects holding a star and a COUNT anywhere below them, marked by walking up
+        # from each star and COUNT once instead of walking down every select
+        selects_with_star: set[int] | None = None
+        selects_with_count: set[int] = set()
         for f in from_statements:
-            if f.parent_select:
-                if f.parent_select.find(exp.Star) and not f.parent_select.find(exp.Count):
-                    if f.args.get("this").args.get("db"):
-                        return True
+            select = f.parent_select
+            # Check the table's dataset before looking at the select
+            if not select or not f.args.get("this").args.get("db"):
+                continue
+            if selects_with_star is None:
+                selects_with_star = _enclosing_selects(index.get(exp.Star, []))
+                selects_with_count = _enclosing_selects(index.get(exp.Count, []))
+            # A star counts unless the select has a COUNT anywhere
+            if id(select) in selects_with_star and id(select) not in selects_with_count:
+                return True
         return False
 
-    def check_semi_join_without_aggregation(self, ast: exp.Expression) -> bool:
+    def check_semi_join_without_aggregation(
+        self, ast: exp.Expression, index: functions.NodeIndex | None = None
+    ) -> bool:
         """
         # Anti Pattern: SEMI-JOIN without aggregation
         if where clause as has a 'value in (select x from) like subquery statement
         it's best practice to select distinct or group by that value in that subquery
         """
-        where_statements = ast.find_all(exp.Where)
+        if index is None:
+            index = functions.index_ast(ast)
+        in_statements = index.get(exp.In, [])
+        if not in_statements:
+            return False
 
-        for w in where_statements:
-            if "IN" in str(w):
-                for s in w.find_all(exp.Select):
-                    if len(list(s.find_all(exp.Distinct))) + len(list(s.find_all(exp.Group))) == 0:
-                        return True
+        # Only the subqueries of the INs in WHERE clauses are semi-joins, other
+        # subqueries of the same WHERE aren't looked at
+        queries = [
+            i.args["query"]
+            for i in in_statements
+            if i.args.get("query") is not None and i.find_ancestor(exp.Where) is not None
+        ]
+        # A nested IN's subquery is also found from the IN around it
+        for query in functions.outermost(queries):
+            for s in functions.iter_typed(query, exp.Select):
+                # One walk of the subquery looks for either form of aggregation
+                if s.find(exp.Distinct, exp.Group) is None:
+                    return True
         return False
 
     def check_order_without_limit(self, ast: exp.Expression) -> bool:
@@ -89,11 +290,11 @@ class Antipatterns:
         Anti Pattern: Using ORDER BY without LIMIT
         queries using order by in the select statement without a limit.
         """
-        if ast.args.get("order") and not ast.args.get("limit"):
-            return True
-        return False
+        return bool(ast.args.get("order") and not ast.args.get("limit"))
 
-    def check_regexp_in_where(self, ast: exp.Expression) -> bool:
+    def check_regexp_in_where(
+        self, ast: exp.Expression, index: functions.NodeIndex | None = None
+    ) -> bool:
         """
         Anti Pattern: Using REGEXP when LIKE is an option
         like is more performant than regexp functions
@@ -101,142 +302,158 @@ class Antipatterns:
         where_statement = ast.args.get("where")
         if not where_statement:
             return False
-        regex_rules = [exp.RegexpLike, exp.RegexpReplace, exp.RegexpExtract]
-        return any(where_statement.find(regex) for regex in regex_rules)
+        if index is None:
+            # One walk of the WHERE clause is cheaper than indexing the whole statement
+            return where_statement.find(*_REGEXP_TYPES) is not None
+        return any(
+            functions.is_descendant(node, where_statement)
+            for regex in _REGEXP_TYPES
+            for node in index.get(regex, [])
+        )
 
-    def check_like_before_more_selective(self, ast: exp.Expression) -> bool:
+    def check_like_before_more_selective(
+        self,
+        ast: exp.Expression,
+        index: functions.NodeIndex | None = None,
+        *,
+        has_regexp: bool | None = None,
+    ) -> bool:
         """
         Anti Pattern: Where order, apply most selective expression first it's checking whether there are cases like
         "Like" or "Regexp Like, Contains" before a more selective statement like IN, EQ,GTE,LTE etc. BQ likes to have more
-        selective statements first At the moment until we figure out a way to sort the hierarchy of statements,
-        it's searching for string conditions
-        TODO: can benefit from tidying up
+        selective statements first. The WHERE clause is walked depth first, which follows the order
+        the conditions are written in, up to the first more selective condition, and the statement is
+        flagged if a LIKE/REGEXP condition came before it. "1=1" / "TRUE" placeholders are ignored.
+        With the statement's node index, the walk is skipped when the WHERE has no LIKE/REGEXP.
+        has_regexp, the result of check_regexp_in_where when already known, saves looking for
+        the REGEXP functions again.
         """
         where_statement = ast.args.get("where")
 
         if not where_statement:
             return False
+        if index is not None and not has_regexp:
+            # Only LIKE is left to look for when the WHERE is known to have no REGEXP
+            gate_types = _LESS_SELECTIVE_TYPES if has_regexp is None else (exp.Like,)
+            if not any(
+                functions.is_descendant(node, where_statement)
+                for node_type in gate_types
+                for node in index.get(node_type, [])
+            ):
+                return False
 
-        if (
-            where_statement.find(exp.Like)
-            or where_statement.find(exp.RegexpLike)
-            or where_statement.find(exp.RegexpReplace)
-            or where_statement.find(exp.RegexpExtract)
-        ):
-            string_version = repr(where_statement.args).replace(" ", "").replace("\n", "")
-            one_eq_one_starter = string_version.find(
-                "EQ(this=Literal(this=1,is_string=False),expression=Literal(this=1"
-            )
-            bool_starter = string_version.find("this=Boolean(this=True)")
-
-            index_starter = max(one_eq_one_starter + bool_starter, 0)
-            less_selective_clause_index = -1
-            like_clause = string_version[index_starter:].find("Like")
-            regexp_clause = string_version[index_starter:].find("Regexp")
-
-            if like_clause > -1:
-                if regexp_clause > -1:
-                    less_selective_clause_index = min(like_clause, less_selective_clause_index)
-                else:
-                    less_selective_clause_index = like_clause
-
-            more_selective_clauses = []
-            if string_version[index_starter:].find("GT") >= 0:
-                more_selective_clauses.append(string_version[index_starter:].find("GT"))
-            if string_version[index_starter:].find("LT") >= 0:
-                more_selective_clauses.append(string_version[index_starter:].find("LT"))
-            if string_version[index_starter:].find("EQ") >= 0:
-                more_selective_clauses.append(string_version[index_starter:].find("EQ"))
-            if string_version[index_starter:].find("expression=In") >= 0:
-                more_selective_clauses.append(string_version[index_starter:].find("expression=In"))
-
-            if more_selective_clauses:
-                if min(more_selective_clauses) > less_selective_clause_index:
-                    return True
+        seen_less_selective = False
+        for node, *_ in where_statement.walk(bfs=False):
+            if isinstance(node, _LESS_SELECTIVE_TYPES):
+                seen_less_selective = True
+            elif isinstance(node, _MORE_SELECTIVE_TYPES) and not _is_placeholder_condition(node):
+                return seen_less_selective
         return False
 
-    def check_multiple_cte_reference(self, ast: exp.Expression) -> bool:
+    def check_multiple_cte_reference(
+        self, ast: exp.Expression, index: functions.NodeIndex | None = None
+    ) -> bool:
         """
         Anti Pattern: Referencing Same Table Multiple Times
         """
-        status = False
-        cte_values = {
-            cte.alias: 0 for cte in ast.find_all(exp.CTE) if len(list(cte.find_all(exp.From))) > 0
-        }
-        if len(cte_values) > 0:
-            for cte in ast.find_all(exp.CTE):
-                for s in cte.find_all(exp.Select):
-                    from_statement = s.args.get("from")
-                    if not from_statement:
-                        continue
-
-                    from_table = str(from_statement.args.get("this"))
-                    if from_table in cte_values:
-                        cte_values[from_table] += 1
-                        if cte_values[from_table] == 2:
-                            status = True
+        if index is None:
+            index = functions.index_ast(ast)
+        cte_aliases: set[str] = set()
+        # CTEs already referenced once, a second reference flags the statement
+        referenced: set[str] = set()
+        for cte in index.get(exp.CTE, []):
+            # One walk of the CTE, a FROM only ever hangs off one of its selects
+            selects = list(functions.iter_typed(cte, exp.Select))
+            if any(s.args.get("from") for s in selects):
+                cte_aliases.add(cte.alias)
+                referenced.discard(cte.alias)
+            for s in selects:
+                from_statement = s.args.get("from")
+                if not from_statement:
+                    continue
+
+                # Compare the unqualified table name, a CTE can't be referenced with a dataset
+                from_table = from_statement.this
+                if not isinstance(from_table, exp.Table) or from_table.db:
+                    continue
+                name = from_table.name
+                if name in cte_aliases:
+                    if name in referenced:
+                        return True
+                    referenced.add(name)
 
-        return status
+        return False
 
     def check_partition_used(
-        self, ast: exp.Expression, columns_dict: dict[str, Any]
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        index: functions.NodeIndex | None = None,
+        partitioned_tables: dict[str, dict[str, Any]] | None = None,
     ) -> tuple[bool, list[dict[str, str]]]:
         """
         Anti Pattern: Table not using partitions
         check if the query is using tables with partition
         check if the query is referring to those partitions in join or where clause
         """
-        used_tables_with_partition = functions.get_partitioned_tables(ast, columns_dict)
+        if index is None:
+            index = functions.index_ast(ast)
+        used_tables_with_partition = partitioned_tables
+        if used_tables_with_partition is None:
+            used_tables_with_partition = functions.get_partitioned_tables(ast, columns_dict)
         result = []
-        passed = []
-        if len(used_tables_with_partition) > 0:
-            tables_with_partitions_used = set()
-            columns_from_join = []
-            columns_from_where = []
-            if ast.find_all(exp.Join):
-                for j in ast.find_all(exp.Join):
-                    columns_from_join += j.find_all(exp.Column)
-            if ast.find_all(exp.Where):
-                for w in ast.find_all(exp.Where):
-                    columns_from_where += w.find_all(exp.Column)
-            for c in columns_from_join + columns_from_where:
+        # Tables already reported, several aliases can point at the same table
+        passed: set[str] = set()
+        if used_tables_with_partition:
+            tables_with_partitions_used: set[str] = set()
+            # The columns used in JOIN and WHERE clauses, nested ones included, taken
+            # from the index instead of walking and concatenating the clauses
+            columns_from_clauses = (
+                c
+                for c in index.get(exp.Column, [])
+                if isinstance(c, exp.Column) and c.find_ancestor(exp.Join, exp.Where) is not None
+            )
+            # Lowercase each partition column once instead of for every column compared
+            partition_columns = {
+                k: v["partition_column"].lower() if v["partition_column"] else None
+                for k, v in used_tables_with_partition.items()
+            }
+            # Tables per partition column, in reference order, so each column is matched
+            # with a dict lookup instead of a scan of every partitioned table
+            partitioned_tables_by_column: defaultdict[str, list[str]] = defaultdict(list)
+            for k, partition_column in partition_columns.items():
+                if partition_column:
+                    partitioned_tables_by_column[partition_column].append(
+                        used_tables_with_partition[k]["full_table_name"]
+                    )
+            # Only tables with a partition column can be matched, once all of them are the
+            # remaining columns can't change the result
+            matchable_count = len(set(chain.from_iterable(partitioned_tables_by_column.values())))
+            for c in columns_from_clauses:
+                if len(tables_with_partitions_used) == matchable_count:
+                    break
                 column_name, table_name = functions.get_column_and_table_name_from_column(c)
                 if column_name:
+                    column_name = column_name.lower()
                     if table_name:
                         if table_name.replace("*", "") in used_tables_with_partition:
-                            if (
-                                column_name.lower()
-                                == used_tables_with_partition[table_name][
-                                    "partition_column"
-                                ].lower()
-                            ):
+                            if column_name == partition_columns.get(table_name):
                                 tables_with_partitions_used.add(
                                     used_tables_with_partition[table_name]["full_table_name"]
                                 )
                     if not table_name:
-                        for t in used_tables_with_partition.keys():
-                            if used_tables_with_partition[t]["partition_column"]:
-                                if (
-                                    column_name.lower()
-                                    == used_tables_with_partition[t]["partition_column"].lower()
-                                ):
-                                    tables_with_partitions_used.add(
-                                        used_tables_with_partition[t]["full_table_name"]
-                                    )
-                                    break
+                        if column_name in partitioned_tables_by_column:
+                            tables_with_partitions_used.add(
+                                partitioned_tables_by_column[column_name][0]
+                            )
                     else:
                         # case for columns used without a fully qualified table name or alias. bad practice
-                        for k, v in used_tables_with_partition.items():
-                            if (
-                                column_name.lower()
-                                == used_tables_with_partition[k]["partition_column"].lower()
-                            ):
-                                tables_with_partitions_used.add(
-                                    used_tables_with_partition[k]["full_table_name"]
-                                )
+                        tables_with_partitions_used.update(
+                            partitioned_tables_by_column.get(column_name, ())
+                        )
             for k, v in used_tables_with_partition.items():
                 if (
-                    v["full_table_name"] not in list(tables_with_partitions_used)
+                    v["full_table_name"] not in tables_with_partitions_used
                     and v["full_table_name"] not in passed
                 ):
                     result.append(
@@ -245,432 +462,387 @@ class Antipatterns:
                             "partitioned_column": v["partition_column"],
                         }
                     )
-                    passed.append(v["full_table_name"])
-        return len(result) > 0, result
+                    passed.add(v["full_table_name"])
+        return bool(result), result
+
+    def check_date_filters(
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        index: functions.NodeIndex | None = None,
+        queried_tables: dict[str, dict[str, Any]] | None = None,
+        *,
+        check_range: bool = True,
+        check_no_date: bool = True,
+    ) -> tuple[bool, bool, list[str]]:
+        """
+        Anti Patterns: Long Date Range and Big Tables With No Date Filter
+        Both look at the same date comparisons in WHERE and JOIN clauses, so they share one walk
+
+        Returns:
+            tuple: (big_date_range, no_date_on_big_table, tables_without_date_filter)
+        """
+        if index is None:
+            index = functions.index_ast(ast)
+        big_date_range = False
+        tables_with_date_filter: set[str] = set()
+        tables_without_date_filter: set[str] = set()
+        date_columns_not_clear: set[str] = set()
+        table_list: set[str] = set()
+        cte_list: set[str] = set()
+        if queried_tables is None:
+            # Only the date filter check reads the queried tables
+            queried_tables = (
+                functions.get_queried_tables(ast, columns_dict, self.config.large_table_row_count)
+                if check_no_date
+                else {}
+            )
+        if check_no_date:
+            cte_list = {cte.alias for cte in index.get(exp.CTE, [])}
+            # The tables read in FROM and JOIN clauses, taken from the index rather
+            # than by walking each clause
+            for i in index.get(exp.Table, []):
+                if not isinstance(i, exp.Table) or i.find_ancestor(exp.From, exp.Join) is None:
+                    continue
+                full_table_name, alias = _date_cte_names(i)
+                if full_table_name:
+                    table_list.add(full_table_name)
+                if alias:
+                    table_list.add(alias)
+
+        # Every range in the statement is measured against the same point in time
+        now = dt.datetime.now()
+        # Each clause is walked once, up to the clauses nested in it, so every comparison is
+        # seen once, from the innermost clause around it. An unnest anywhere in that clause
+        # is also in every clause around it, so it alone decides whether the filter counts
+        scanned: dict[int, tuple[list[exp.Expression], bool]] = {}
+        # Whether each select holds a CTE, shared by every comparison in the statement
+        select_has_cte: dict[int, bool] = {}
+        # The table names of each select a comparison is matched against
+        select_tables: dict[int, list[tuple[str | None, str | None]]] = {}
+        for w in chain(index.get(exp.Where, []), index.get(exp.Join, [])):
+            # Once the range is found to be big, only the date filters need the other clauses
+            if not check_no_date and (big_date_range or not check_range):
+                break
+            comparisons, has_unnest = _scan_clause(w, scanned)
+            # Filters on unnested arrays don't limit the scanned tables
+            filter_dates = check_no_date and not has_unnest
+            for d in comparisons:
+                size_range = check_range and not big_date_range and not isinstance(d, exp.EQ)
+                if not (size_range or filter_dates):
+                    continue
+                identifier = d.args["this"].find(exp.Identifier)
+                if not identifier:
+                    continue
+                case_check = identifier.args.get("this").lower()
+                # Walk the comparison once, if at all, for both checks
+                d_index = None
+                if size_range:
+                    d_index = functions.index_ast(d)
+                    big_date_range = self._is_big_date_range(d, case_check, d_index, now=now)
+                if filter_dates and _DATE_LIKE_RE.search(case_check):
+                    self._record_date_filter(
+                        d,
+                        queried_tables,
+                        d_index=d_index,
+                        table_list=table_list,
+                        cte_list=cte_list,
+                        tables_with_date_filter=tables_with_date_filter,
+                        tables_without_date_filter=tables_without_date_filter,
+                        date_columns_not_clear=date_columns_not_clear,
+                        select_has_cte=select_has_cte,
+                        select_tables=select_tables,
+                    )
 
-    def check_big_date_range(self, ast: exp.Expression) -> bool:
+        tables = []
+        if check_no_date:
+            result_table_list = (
+                queried_tables.keys() | tables_without_date_filter
+            ) - tables_with_date_filter
+            for t in result_table_list:
+                if not (queried_tables[t]["is_alias"]):
+                    if date_columns_not_clear.isdisjoint(
+                        queried_tables[t]["available_datetime_columns_list"]
+                    ):
+                        if "dim_" not in queried_tables[t]["table"]:
+                            tables.append(t)
+        return big_date_range, bool(tables), tables
+
+    def _is_big_date_range(
+        self,
+        d: exp.Expression,
+        case_check: str,
+        d_index: functions.NodeIndex | None = None,
+        *,
+        now: dt.datetime | None = None,
+    ) -> bool:
+        """Check if a date comparison covers more than a year before now (default: current time)"""
+        if now is None:
+            now = dt.datetime.now()
+        if d_index is None:
+            d_index = functions.index_ast(d)
+        if exp.Cast in d_index:
+            case_check = str(d_index[exp.Cast][0].args.get("to").args.get("this")).lower()
+        if not _DATE_LIKE_RE.search(case_check):
+            return False
+        date_diff: float | None = None
+        if (
+            exp.DateSub in d_index
+            or exp.Sub in d_index
+            or (exp.Neg in d_index and exp.DateAdd in d_index)
+        ):
+            for i in chain(
+                d_index.get(exp.DateSub, []), d_index.get(exp.Sub, []), d_index.get(exp.DateAdd, [])
+            ):
+                # The nodes under i, from the comparison's index rather than a new walk of i
+                i_nodes = {
+                    node_type: [
+                        n for n in d_index.get(node_type, []) if functions.is_descendant(n, i)
+                    ]
+                    for node_type in (exp.Literal, exp.Var, exp.Mul)
+                }
+                multiplier: float | None = None
+                for j in i_nodes[exp.Literal]:
+                    try:
+                        length = int(j.args["this"])
+                    except (TypeError, ValueError):
+                        continue
+                    # The same for every literal of i, worked out at the first one
+                    if multiplier is None:
+                        multiplier = 1
+                        if i.args.get("unit"):
+                            multiplier = _DAYS.get(i.args.get("unit").args.get("this"))
+                        if i_nodes[exp.Var]:
+                            multiplier = _DAYS.get(i_nodes[exp.Var][0].args["this"])
+                        elif i_nodes[exp.Mul]:
+                            multiplier = int(i_nodes[exp.Mul][0].args["expression"].args["this"])
+                        if multiplier is None:
+                            # A date part with no day count, e.g. MILLISECOND, isn't sized
+                            break
+                    date_diff = length * multiplier
+        elif d.args.get("low"):
+            date_exp = str(d.args.get("low").args.get("this")).replace("'", "")
+            date_diff = _days_since(date_exp, now)
+        else:
+            # First literal of the compared value, in the same BFS order as find()
+            expression = d.args["expression"]
+            literal = next(
+                (j for j in d_index.get(exp.Literal, []) if functions.is_descendant(j, expression)),
+                None,
+            )
+            if literal:
+                date_exp = str(literal.args.get("this"))
+                date_diff = _days_since(date_exp, now)
+        return date_diff is not None and date_diff > 365
+
+    def _record_date_filter(
+        self,
+        d: exp.Expression,
+        queried_tables: dict[str, dict[str, Any]],
+        *,
+        d_index: functions.NodeIndex | None = None,
+        table_list: set[str],
+        cte_list: set[str],
+        tables_with_date_filter: set[str],
+        tables_without_date_filter: set[str],
+        date_columns_not_clear: set[str],
+        select_has_cte: dict[int, bool] | None = None,
+        select_tables: dict[int, list[tuple[str | None, str | None]]] | None = None,
+    ) -> None:
+        """Record the queried tables a date comparison filters, or fails to filter"""
+        if select_has_cte is None:
+            select_has_cte = {}
+        if select_tables is None:
+            select_tables = {}
+        # Resolve each compared column once, the pairwise loop below reuses the names
+        compared_columns = (
+            d_index.get(exp.Column, []) if d_index is not None else d.find_all(exp.Column)
+        )
+        columns = [
+            (c, *functions.get_column_and_table_name_from_column(c))
+            for c in compared_columns
+            if isinstance(c, exp.Column)
+        ]
+        if not columns:
+            # Nothing to match, e.g. an identifier that isn't a column
+            return
+        first_column, first_column_name, first_column_table = columns[0]
+
+        if len(columns) == 1:
+            if not first_column.args.get("table"):
+                # A column without a name, such as t.*, can't be a date column
+                if d.parent_select and first_column_name is not None:
+                    _record_select_tables(
+                        d.parent_select,
+                        first_column_name,
+                        queried_tables,
+                        tables_with_date_filter,
+                        tables_without_date_filter,
+                        select_tables=select_tables,
+                    )
+                return
+            if first_column_table not in queried_tables:
+                return
+            queried_table = queried_tables[first_column_table]
+            if first_column_name in queried_table["available_datetime_columns_list"]:
+                tables_with_date_filter.add(first_column_table)
+                tables_with_date_filter.add(queried_table["full_table_name"])
+            return
+
+        # if there are two columns being compared in a date function that's not necessarily a limiting date condition
+        # The first compared column on a queried table, the same for every column below
+        first_queried_table = next((t for _, _, t in columns if t in queried_tables), None)
+        # The comparison's select and whether it reads a table, looked up once for every
+        # column below rather than walking up and back down the tree for each
+        d_select = d.parent_select
+        d_select_has_table: bool | None = None
+        for c, column_name, column_table in columns:
+            c_select = c.parent_select
+            if not c_select:
+                continue
+            # Set lookups first, the CTE search walks the whole select, so its
+            # answer is kept per select for the rest of the statement
+            filtered = column_table in table_list or column_table in cte_list
+            if not filtered:
+                if id(c_select) not in select_has_cte:
+                    select_has_cte[id(c_select)] = c_select.find(exp.CTE) is not None
+                filtered = select_has_cte[id(c_select)]
+            if filtered:
+                if first_queried_table is not None:
+                    tables_with_date_filter.add(first_queried_table)
+                    tables_with_date_filter.add(
+                        queried_tables[first_queried_table]["full_table_name"]
+                    )
+                continue
+            if d_select_has_table is None:
+                # No select above the comparison in an UPDATE or DELETE condition
+                d_select_has_table = d_select is not None and d_select.find(exp.Table) is not None
+            if d_select is not None and d_select_has_table:
+                if column_name is not None:
+                    _record_select_tables(
+                        d_select,
+                        column_name,
+                        queried_tables,
+                        tables_with_date_filter,
+                        tables_without_date_filter,
+                        select_tables=select_tables,
+                    )
+            elif not first_column.args.get("table"):
+                date_columns_not_clear.add(str(first_column_name))
+            elif first_column_table in queried_tables:
+                tables_without_date_filter.add(first_column_table)
+                tables_without_date_filter.add(
+                    queried_tables[first_column_table]["full_table_name"]
+                )
+
+    def check_big_date_range(
+        self, ast: exp.Expression, index: functions.NodeIndex | None = None
+    ) -> bool:
         """
         Anti Pattern: Long Date Range
         check if the query is using date range that is more than a year
         """
-        status = False
-        days = {
-            "DAY": 1,
-            "WEEK": 7,
-            "MONTH": 30,
-            "YEAR": 365,
-            "MINUTE": 0.0007,
-            "HOUR": 0.04,
-            "QUARTER": 90,
-            "SECOND": 0.00001166666667,
-        }
-        if len(list(ast.find_all(exp.Where)) + list(ast.find_all(exp.Join))) > 0:
-            for w in list(ast.find_all(exp.Where)) + list(ast.find_all(exp.Join)):
-                for d in (
-                    list(w.find_all(exp.Between))
-                    + list(w.find_all(exp.GTE))
-                    + list(w.find_all(exp.GT))
-                ):
-                    if d.args["this"].find(exp.Identifier):
-                        case_check = d.args["this"].find(exp.Identifier).args.get("this").lower()
-                        if d.find(exp.Cast):
-                            case_check = str(
-                                d.find(exp.Cast).args.get("to").args.get("this")
-                            ).lower()
-                        if (
-                            "date" in case_check
-                            or "time" in case_check
-                            or "partition" in case_check
-                        ):
-                            date_diff = None
-                            if (
-                                d.find(exp.DateSub)
-                                or d.find(exp.Sub)
-                                or (d.find(exp.Neg) and d.find(exp.DateAdd))
-                            ):
-                                for i in (
-                                    list(d.find_all(exp.DateSub))
-                                    + list(d.find_all(exp.Sub))
-                                    + list(d.find_all(exp.DateAdd))
-                                ):
-                                    if i.find(exp.Literal):
-                                        for j in i.find_all(exp.Literal):
-                                            if str(j.args.get("this")).isnumeric():
-                                                length = int(j.args.get("this"))
-                                                multiplier = 1
-                                                if i.args.get("unit"):
-                                                    multiplier = days[
-                                                        i.args.get("unit").args.get("this")
-                                                    ]
-                                                if i.find(exp.Var):
-                                                    multiplier = days[i.find(exp.Var).args["this"]]
-                                                elif i.find(exp.Mul):
-                                                    multiplier = int(
-                                                        i.find(exp.Mul)
-                                                        .args["expression"]
-                                                        .args["this"]
-                                                    )
-                                                date_diff = length * multiplier
-                            elif d.args.get("low"):
-                                date_exp = str(d.args.get("low").args.get("this")).replace("'", "")
-                                if len(str(date_exp)) > 9 and "-" in str(date_exp):
-                                    date_conv = dt.datetime.strptime(date_exp[:10], "%Y-%m-%d")
-                                    date_diff = (dt.datetime.now() - date_conv).days
-                            elif d.args["expression"].find(exp.Literal):
-                                date_exp = d.args["expression"].find(exp.Literal).args.get("this")
-                                if len(str(date_exp)) > 9 and "-" in str(date_exp):
-                                    date_conv = dt.datetime.strptime(date_exp[:10], "%Y-%m-%d")
-                                    date_diff = (dt.datetime.now() - date_conv).days
-                            if date_diff:
-                                if date_diff > 365:
-                                    status = True
-        return status
+        big_date_range, _, _ = self.check_date_filters(ast, {}, index, check_no_date=False)
+        return big_date_range
 
     def check_big_table_no_date(
-        self, ast: exp.Expression, columns_dict: dict[str, Any]
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        index: functions.NodeIndex | None = None,
+        queried_tables: dict[str, dict[str, Any]] | None = None,
     ) -> tuple[bool, list[str]]:
         """
         Anti Pattern: Big Tables With No Date Filter
-        TODO: can benefit from tidying up
-        """
-
-        """
-        Anti Pattern: Big Tables With No Date Filter
-        TODO: can benefit from tidying up
         """
-
-        def date_cte_names(table: exp.Table) -> tuple[str | None, str | None]:
-            # need a way to find ctes used for date filteration
-            this = table.args.get("this")
-            if not this:
-                _ftn = None
-            else:
-                _ftn = this.args.get("this") if this else None
-            _alias = (
-                table.args.get("alias").args.get("this").args.get("this")
-                if table.args.get("alias")
-                else None
-            )
-            if table.args.get("db"):
-                return None, None
-            return _ftn, _alias
-
-        tables_with_date_filter = set()
-        tables_without_date_filter = set()
-        queried_tables = functions.get_queried_tables(
-            ast, columns_dict, self.config.large_table_row_count
-        )
-        cte_list = []
-        if ast.find_all(exp.CTE):
-            cte_list = [cte.alias for cte in ast.find_all(exp.CTE)]
-        date_columns_not_clear = set()
-        tables = []
-        table_list = set()
-        if len(list(ast.find_all(exp.From))) > 0 or len(list(ast.find_all(exp.Join))) > 0:
-            for t in list(ast.find_all(exp.From)) + list(ast.find_all(exp.Join)):
-                for i in t.find_all(exp.Table):
-                    full_table_name, alias = date_cte_names(i)
-                    if full_table_name:
-                        table_list.add(full_table_name)
-                    if alias:
-                        table_list.add(alias)
-        if len(list(ast.find_all(exp.Where))) > 0 or len(list(ast.find_all(exp.Join))) > 0:
-            for w in list(ast.find_all(exp.Where)) + list(ast.find_all(exp.Join)):
-                if not w.find(exp.Unnest):
-                    if (
-                        len(
-                            list(w.find_all(exp.Between))
-                            + list(w.find_all(exp.GTE))
-                            + list(w.find_all(exp.GT))
-                            + list(w.find_all(exp.EQ))
-                        )
-                        > 0
-                    ):
-                        for d in (
-                            list(w.find_all(exp.Between))
-                            + list(w.find_all(exp.GTE))
-                            + list(w.find_all(exp.GT))
-                            + list(w.find_all(exp.EQ))
-                        ):
-                            if d.find(exp.Identifier) and d.args["this"].find(exp.Identifier):
-                                case_check = (
-                                    d.args["this"].find(exp.Identifier).args.get("this").lower()
-                                )
-                                if (
-                                    "date" in case_check
-                                    or "time" in case_check
-                                    or "partition" in case_check
-                                ):
-                                    if len(list(d.find_all(exp.Column))) > 1:
-                                        # if there are two columns being compared in a date function that's not necessarily a limiting date condition
-                                        for c in d.find_all(exp.Column):
-                                            column_name, table_name = (
-                                                functions.get_column_and_table_name_from_column(c)
-                                            )
-                                            if c.parent_select:
-                                                if (
-                                                    c.parent_select.find(exp.CTE)
-                                                    or table_name in list(table_list)
-                                                    or table_name in cte_list
-                                                ):
-                                                    for c2 in d.find_all(exp.Column):
-                                                        column_name, table_name = (
-                                                            functions.get_column_and_table_name_from_column(
-                                                                c2
-                                                            )
-                                                        )
-                                                        if table_name in queried_tables:
-                                                            tables_with_date_filter.add(table_name)
-                                                            tables_with_date_filter.add(
-                                                                queried_tables[table_name][
-                                                                    "full_table_name"
-                                                                ]
-                                                            )
-                                                            break
-                                                elif (
-                                                    len(list(d.parent_select.find_all(exp.Table)))
-                                                    > 0
-                                                ):
-                                                    for t in d.parent_select.find_all(exp.Table):
-                                                        table_name = str(
-                                                            t.args.get("this").args.get("this")
-                                                        )
-                                                        if t.args.get("db") and not t.args.get(
-                                                            "catalog"
-                                                        ):
-                                                            table_name = t.args.get("db").args.get(
-                                                                "this"
-                                                            )
-                                                        if t.args.get("catalog"):
-                                                            table_name = (
-                                                                t.args.get("catalog").args.get(
-                                                                    "this"
-                                                                )
-                                                                + "."
-                                                                + t.args.get("db").args.get("this")
-                                                                + "."
-                                                                + table_name
-                                                            )
-                                                            if table_name in queried_tables:
-                                                                if (
-                                                                    column_name
-                                                                    in queried_tables[table_name][
-                                                                        "available_datetime_columns_list"
-                                                                    ]
-                                                                ):
-                                                                    tables_with_date_filter.add(
-                                                                        table_name
-                                                                    )
-                                                                else:
-                                                                    tables_without_date_filter.add(
-                                                                        table_name
-                                                                    )
-                                                        if t.args.get("alias"):
-                                                            alias = str(
-                                                                t.args.get("alias").args.get("this")
-                                                            )
-                                                            if alias in queried_tables:
-                                                                if (
-                                                                    column_name
-                                                                    in queried_tables[alias][
-                                                                        "available_datetime_columns_list"
-                                                                    ]
-                                                                ):
-                                                                    tables_with_date_filter.add(
-                                                                        alias
-                                                                    )
-                                                                    tables_with_date_filter.add(
-                                                                        queried_tables[alias][
-                                                                            "full_table_name"
-                                                                        ]
-                                                                    )
-                                                                else:
-                                                                    tables_without_date_filter.add(
-                                                                        alias
-                                                                    )
-                                                                    tables_without_date_filter.add(
-                                                                        queried_tables[alias][
-                                                                            "full_table_name"
-                                                                        ]
-                                                                    )
-                                                elif not d.find(exp.Column).args.get("table"):
-                                                    column = d.find(exp.Column)
-                                                    date_columns_not_clear.add(
-                                                        str(
-                                                            column.args.get("this").args.get("this")
-                                                        )
-                                                    )
-                                                else:
-                                                    column = d.find(exp.Column)
-
-                                                    table_name = column.args.get("table").args.get(
-                                                        "this"
-                                                    )
-                                                    if column.args.get(
-                                                        "db"
-                                                    ) and not column.args.get("catalog"):
-                                                        table_name = column.args.get("db").args.get(
-                                                            "this"
-                                                        )
-                                                    if column.args.get("catalog"):
-                                                        table_name = (
-                                                            column.args.get("catalog").args.get(
-                                                                "this"
-                                                            )
-                                                            + "."
-                                                            + column.args.get("db").args.get("this")
-                                                            + "."
-                                                            + column.args.get("table").args.get(
-                                                                "this"
-                                                            )
-                                                        )
-                                                    if table_name in queried_tables:
-                                                        tables_without_date_filter.add(table_name)
-                                                        tables_without_date_filter.add(
-                                                            queried_tables[table_name][
-                                                                "full_table_name"
-                                                            ]
-                                                        )
-                                    else:
-                                        c = d.find(exp.Column)
-                                        column = c.args.get("this").args.get("this")
-                                        if c.args.get("table"):
-                                            column_name, table_name = (
-                                                functions.get_column_and_table_name_from_column(c)
-                                            )
-                                            if table_name in queried_tables:
-                                                if (
-                                                    column
-                                                    in queried_tables[table_name][
-                                                        "available_datetime_columns_list"
-                                                    ]
-                                                ):
-                                                    tables_with_date_filter.add(table_name)
-                                                    tables_with_date_filter.add(
-                                                        queried_tables[table_name][
-                                                            "full_table_name"
-                                                        ]
-                                                    )
-                                        elif d.parent_select:
-                                            if len(list(d.parent_select.find_all(exp.Table))) > 0:
-                                                for t in d.parent_select.find_all(exp.Table):
-                                                    table_name = str(
-                                                        t.args.get("this").args.get("this")
-                                                    )
-                                                    if t.args.get("db") and not t.args.get(
-                                                        "catalog"
-                                                    ):
-                                                        table_name = t.args.get("db").args.get(
-                                                            "this"
-                                                        )
-                                                    if t.args.get("catalog"):
-                                                        table_name = (
-                                                            t.args.get("catalog").args.get("this")
-                                                            + "."
-                                                            + t.args.get("db").args.get("this")
-                                                            + "."
-                                                            + table_name
-                                                        )
-                                                        if table_name in queried_tables:
-                                                            if (
-                                                                column
-                                                                in queried_tables[table_name][
-                                                                    "available_datetime_columns_list"
-                                                                ]
-                                                            ):
-                                                                tables_with_date_filter.add(
-                                                                    table_name
-                                                                )
-                                                            else:
-                                                                tables_without_date_filter.add(
-                                                                    table_name
-                                                                )
-                                                    if t.args.get("alias"):
-                                                        alias = str(
-                                                            t.args.get("alias").args.get("this")
-                                                        )
-                                                        if alias in queried_tables:
-                                                            if (
-                                                                column
-                                                                in queried_tables[alias][
-                                                                    "available_datetime_columns_list"
-                                                                ]
-                                                            ):
-                                                                tables_with_date_filter.add(alias)
-                                                                tables_with_date_filter.add(
-                                                                    queried_tables[alias][
-                                                                        "full_table_name"
-                                                                    ]
-                                                                )
-                                                            else:
-                                                                tables_without_date_filter.add(
-                                                                    alias
-                                                                )
-                                                                tables_without_date_filter.add(
-                                                                    queried_tables[alias][
-                                                                        "full_table_name"
-                                                                    ]
-                                                                )
-        result_table_list = set(
-            list(tables_without_date_filter - tables_with_date_filter)
-            + list(set(list(queried_tables)) - tables_with_date_filter)
+        _, no_date_on_big_table, tables_without_date_filter = self.check_date_filters(
+            ast, columns_dict, index, queried_tables, check_range=False
         )
-        if len(result_table_list) > 0:
-            for t in result_table_list:
-                if not (queried_tables[t]["is_alias"]):
-                    if not date_columns_not_clear & set(
-                        queried_tables[t]["available_datetime_columns_list"]
-                    ):
-                        if "dim_" not in queried_tables[t]["table"]:
-                            tables.append(t)
-        return len(tables) > 0, tables
+        return no_date_on_big_table, tables_without_date_filter
 
     def check_unpartitioned_tables(
-        self, ast: exp.Expression, columns_dict: dict[str, Any]
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        queried_tables: dict[str, dict[str, Any]] | None = None,
     ) -> tuple[bool, list[str]]:
         """
         Anti Pattern: Querying Unpartitioned Tables
         """
-        queried_tables = functions.get_queried_tables(
-            ast, columns_dict, self.config.large_table_row_count
-        )
+        if queried_tables is None:
+            queried_tables = functions.get_queried_tables(
+                ast, columns_dict, self.config.large_table_row_count
+            )
         result: list[str] = []
-        if len(queried_tables) > 0:
+        if queried_tables:
             for k, v in queried_tables.items():
                 if not v["partitioned_column"] and not v["is_alias"] and "dim_" not in v["table"]:
                     result.append(k)
-        return len(result) > 0, result
+        return bool(result), result
 
     def check_distinct_on_big_table(
-        self, ast: exp.Expression, columns_dict: dict[str, Any]
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        index: functions.NodeIndex | None = None,
+        queried_tables: dict[str, dict[str, Any]] | None = None,
     ) -> bool:
         """
         Anti Pattern: Using DISTINCT on Big Tables
         """
-        queried_tables = functions.get_queried_tables(
-            ast, columns_dict, self.config.distinct_function_row_count
-        )
-        if len(queried_tables) > 0:
-            _exp = ast.find(exp.Select)
-            if not _exp:
-                return False
-            if _exp.find(exp.Distinct):
-                return True
-        return False
+        if queried_tables is None:
+            queried_tables = functions.get_queried_tables(
+                ast, columns_dict, self.config.distinct_function_row_count
+            )
+        if not queried_tables:
+            return False
+        if index is None:
+            index = functions.index_ast(ast)
+        _exp = next(iter(index.get(exp.Select, [])), None)
+        return _exp is not None and _has_distinct(_exp, index)
 
     def check_count_distinct_on_big_table(
-        self, ast: exp.Expression, columns_dict: dict[str, Any]
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        index: functions.NodeIndex | None = None,
+        queried_tables: dict[str, dict[str, Any]] | None = None,
     ) -> bool:
         """
         Anti Pattern: Using COUNT DISTINCT on Big Tables
         """
-        queried_tables = functions.get_queried_tables(
-            ast, columns_dict, self.config.distinct_function_row_count
-        )
-        if len(queried_tables) > 0:
-            _exp = ast.find(exp.Count)
-            if not _exp:
-                return False
-            if _exp.find(exp.Distinct):
-                return True
-        return False
+        if queried_tables is None:
+            queried_tables = functions.get_queried_tables(
+                ast, columns_dict, self.config.distinct_function_row_count
+            )
+        if not queried_tables:
+            return False
+        if index is None:
+            index = functions.index_ast(ast)
+        _exp = next(iter(index.get(exp.Count, [])), None)
+        return _exp is not None and _has_distinct(_exp, index)
+
+
+# Shared checkers by id() of their Config. Each checker holds its config, so an id
+# can't be reused by another Config while its entry is cached
+_CHECKERS: dict[int, Antipatterns] = {}
+_MAX_CHECKERS = 8
+
+
+def get_checker(config: Config | None = None) -> Antipatterns:
+    """Get a shared Antipatterns instance for config (default: the default configuration).
+
+    Callers passing the same Config object reuse one checker rather than resolving
+    its enabled checks again each time. The checker is cached by the object's id and
+    keeps the enabled checks it resolved when it was built, so the Config must not be
+    changed after its first use here. Build a new Config, or an Antipatterns directly,
+    to check with different settings.
+    """
+    if config is None:
+        config = get_default_config()
+    checker = _CHECKERS.get(id(config))
+    if checker is None:
+        if len(_CHECKERS) >= _MAX_CHECKERS:
+            _CHECKERS.clear()
+        checker = _CHECKERS[id(config)] = Antipatterns(config)
+    return checker
@@ -18,14 +18,211 @@ Example:
     >>> print(f"SELECT * detected: {job.select_star}")
 """
 
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from collections.abc import Iterable, Sized
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
 from typing import Any
 
+import sqlglot
 import sqlparse
-from sqlglot import exp, parse_one
+from sqlglot import exp, parse_one, serde
+
+from bq_sql_antipattern_checker import functions
+from bq_sql_antipattern_checker.__version__ import __version__
+from bq_sql_antipattern_checker.antipatterns import Antipatterns, get_checker
+from bq_sql_antipattern_checker.config import Config, get_default_config
+
+logger = logging.getLogger(__name__)
+
+# Worker process state, set once per worker by _init_worker
+_WORKER_STATE: dict[str, Any] = {}
+
+# Distinct checked statements kept per worker, like the parsed statements of _parse_cached
+STATEMENT_CACHE_SIZE = 4096
+
+# Directory of the optional on-disk parse cache, and its size budget in megabytes
+PARSE_CACHE_DIR_ENV = "BQ_ANTIPATTERN_PARSE_CACHE"
+PARSE_CACHE_MAX_MB_ENV = "BQ_ANTIPATTERN_PARSE_CACHE_MAX_MB"
+
+
+# Boolean checks by antipattern name and the Job attribute holding their flag. Once
+# a statement sets the flag, the check is skipped for the job's later statements
+_FLAG_ATTRIBUTES = {
+    "big_date_range": "big_date_range",
+    "select_star": "select_star",
+    "multiple_cte_reference": "references_cte_multiple_times",
+    "semi_join_without_aggregation": "semi_join_without_aggregation",
+    "order_without_limit": "order_without_limit",
+    "like_before_more_selective": "like_before_more_selective",
+    "regexp_in_where": "regexp_in_where",
+    "distinct_on_big_table": "distinct_on_big_table",
+    "count_distinct_on_big_table": "count_distinct_on_big_table",
+}
+
+# Checks that need the table metadata resolved by Job.get_statement_tables()
+_TABLE_CHECKS = frozenset(
+    {
+        "partition_not_used",
+        "big_table_no_date",
+        "unpartitioned_tables",
+        "distinct_on_big_table",
+        "count_distinct_on_big_table",
+    }
+)
+
+# Checks run with just (ast, index), as (antipattern name, Antipatterns method name)
+_AST_CHECKS = tuple(
+    (name, f"check_{name}")
+    for name in (
+        "select_star",
+        "multiple_cte_reference",
+        "semi_join_without_aggregation",
+        "regexp_in_where",
+    )
+)
+
+
+class StatementCache(OrderedDict[tuple[str, frozenset[str]], dict[str, Any]]):
+    """Check results per (statement, pending checks), dropping the least recently used.
+
+    Args:
+        maxsize: Number of statements kept, defaults to STATEMENT_CACHE_SIZE
+    """
+
+    def __init__(self, maxsize: int = STATEMENT_CACHE_SIZE) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: tuple[str, frozenset[str]]) -> dict[str, Any]:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: tuple[str, frozenset[str]], value: dict[str, Any]) -> None:
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+@lru_cache(maxsize=2048)
+def _split_cached(query: str) -> tuple[str, ...]:
+    """Split a query into statements, reusing the result for repeated query text."""
+    return tuple(sqlparse.split(query))
+
+
+def _parse_cache_path(sql: str) -> Path | None:
+    """Return the on-disk parse cache file for a statement, if the cache is enabled."""
+    cache_dir = os.environ.get(PARSE_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    key = hashlib.blake2b(f"{__version__}\0{sqlglot.__version__}\0{sql}".encode(), digest_size=16)
+    return Path(cache_dir) / f"{key.hexdigest()}.json"
 
-from bq_sql_antipattern_checker.antipatterns import Antipatterns
-from bq_sql_antipattern_checker.config import Config
+
+def _load_ast(obj: Any) -> Any:
+    """Rebuild a node dumped by sqlglot.serde.dump, allowing only sqlglot expression classes.
+
+    Unlike sqlglot.serde.load, class names are never imported, so a tampered cache
+    file can at worst fail to load, not run code.
+    """
+    if isinstance(obj, list):
+        return [_load_ast(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    class_name = obj["class"]
+    if class_name == "DataType.Type":
+        return exp.DataType.Type(obj["value"])
+    klass = getattr(exp, class_name, None)
+    if not (isinstance(klass, type) and issubclass(klass, exp.Expression)):
+        raise ValueError(f"Unexpected class in parse cache: {class_name}")
+    node = klass(**{k: _load_ast(v) for k, v in obj["args"].items()})
+    node.type = _load_ast(obj.get("type"))
+    node.comments = obj.get("comments")
+    node._meta = obj.get("meta")
+    return node
+
+
+def _read_parse_cache(cache_path: Path) -> exp.Expression:
+    """Load a cached statement and mark it as recently used for prune_parse_cache."""
+    ast = _load_ast(json.loads(cache_path.read_text(encoding="utf-8")))
+    if not isinstance(ast, exp.Expression):
+        raise ValueError("Parse cache entry is not a SQL expression")
+    cache_path.touch()
+    return ast
+
+
+def _write_parse_cache(cache_path: Path, ast: exp.Expression) -> None:
+    """Store a parsed statement atomically, so concurrent workers never read partial files."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent, delete=False
+        ) as f:
+            json.dump(serde.dump(ast), f)
+        Path(f.name).replace(cache_path)
+    except Exception as e:
+        logger.warning("Error writing parse cache: %s", e)
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(sql: str) -> tuple[exp.Expression, functions.NodeIndex]:
+    """Parse and index a BigQuery statement, reusing both for repeated statement text.
+
+    The checks only read the AST, so the same tree and its node index can be
+    shared between all checks and jobs. When PARSE_CACHE_DIR_ENV is set, parsed
+    statements are also kept on disk as JSON, keyed on the exact statement text
+    and the package and sqlglot versions, so scheduled queries seen on earlier
+    runs skip parsing.
+    """
+    cache_path = _parse_cache_path(sql)
+    ast = None
+    if cache_path is not None and cache_path.exists():
+        try:
+            ast = _read_parse_cache(cache_path)
+        except Exception as e:
+            logger.warning("Error reading parse cache: %s", e)
+
+    if ast is None:
+        ast = parse_one(sql, dialect="bigquery")
+        if cache_path is not None:
+            _write_parse_cache(cache_path, ast)
+    return ast, functions.index_ast(ast)
+
+
+def prune_parse_cache(max_bytes: int | None = None) -> None:
+    """Drop the least recently used on-disk parse cache entries until the cache fits.
+
+    Args:
+        max_bytes: Size budget of the cache directory, defaults to
+            PARSE_CACHE_MAX_MB_ENV megabytes (256 when unset)
+    """
+    cache_dir = os.environ.get(PARSE_CACHE_DIR_ENV)
+    if not cache_dir:
+        return
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(PARSE_CACHE_MAX_MB_ENV, "256")) * 1024 * 1024
+
+    # Cache hits touch their entry, so the modification time is the last use
+    entries = []
+    for path in Path(cache_dir).glob("*.json"):
+        stat = path.stat()
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
 
 
 class Job:
@@ -45,6 +242,37 @@ class Job:
         Various antipattern flags (select_star, partition_not_used, etc.)
     """
 
+    # Jobs are created for every job in the analysed period, slots keep them small.
+    # The order is the output column order used by to_dict()
+    __slots__ = (  # noqa: RUF023
+        "creation_date",
+        "creation_time",
+        "project_id",
+        "user_email",
+        "reservation_id",
+        "total_process_gb",
+        "total_slot_hrs",
+        "total_duration_mins",
+        "query",
+        "partition_not_used",
+        "available_partitions",
+        "big_date_range",
+        "no_date_on_big_table",
+        "tables_without_date_filter",
+        "select_star",
+        "references_cte_multiple_times",
+        "semi_join_without_aggregation",
+        "order_without_limit",
+        "like_before_more_selective",
+        "regexp_in_where",
+        "queries_unpartitioned_table",
+        "unpartitioned_tables",
+        "distinct_on_big_table",
+        "count_distinct_on_big_table",
+        "antipattern_run_time",
+        "antipatterns",
+    )
+
     def __init__(self, v: dict[str, Any], antipatterns: Antipatterns) -> None:
         """Initialize Job with BigQuery job metadata.
 
@@ -82,183 +310,423 @@ class Job:
         self.antipattern_run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.antipatterns = antipatterns
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the job metadata and antipattern results, ready for the output DataFrame.
+
+        Returns:
+            dict: Job attributes in output column order, without the Antipatterns object
+        """
+        return dict(zip(JOB_OUTPUT_FIELDS, _get_job_output_values(self), strict=True))
+
+    def get_enabled_antipatterns(self, config: Config) -> frozenset[str]:
+        """Return the enabled antipattern checks for config.
+
+        Reuses the set resolved by the Antipatterns object when it was built from
+        the same config, or by the shared checker for config otherwise, so the
+        flags aren't looked up again for every job.
+        """
+        if config is self.antipatterns.config:
+            return self.antipatterns.enabled
+        return get_checker(config).enabled
+
     def get_statements(self) -> list[str]:
         """Split the job query into individual SQL statements.
 
         Uses sqlparse to split multi-statement queries into individual
-        statements for separate analysis.
+        statements for separate analysis. Scheduled and templated queries repeat
+        often, so splits are cached per query text.
 
         Returns:
             list: List of individual SQL statement strings
         """
-        statements: list[str] = sqlparse.split(self.query)
-        return statements
+        return list(_split_cached(self.query))
+
+    def get_pending_checks(self, config: Config) -> frozenset[str]:
+        """Return the enabled checks still worth running on the job's next statement.
+
+        A job can run many statements and one case is enough to flag it, so
+        boolean checks are left out once their flag is already set.
+        """
+        return self.get_enabled_antipatterns(config).difference(
+            name for name, attr in _FLAG_ATTRIBUTES.items() if getattr(self, attr)
+        )
+
+    def get_statement_tables(
+        self,
+        ast: exp.Expression,
+        columns_dict: dict[str, Any],
+        config: Config,
+        table_index: functions.TableIndex | None = None,
+        index: functions.NodeIndex | None = None,
+        *,
+        checks: frozenset[str] | None = None,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None, dict[str, Any] | None]:
+        """Resolve the table metadata used by the table based checks of a statement.
+
+        Each lookup is only done when a check that needs it is run, and is
+        skipped (left as None) on error so the checks can report it themselves.
+
+        Args:
+            ast: SQLGlot AST of the statement
+            columns_dict: Dictionary of table metadata from get_columns_dict()
+            config: Configuration deciding which antipatterns are enabled
+            table_index: Optional TableIndex over columns_dict to match table names faster
+            index: Optional node index of the statement from functions.index_ast()
+            checks: Names of the checks to run, defaults to get_pending_checks()
+
+        Returns:
+            tuple: (partitioned_tables, queried_tables, distinct_queried_tables)
+        """
+        thresholds = self.antipatterns.config
+        if checks is None:
+            checks = self.get_pending_checks(config)
+        partitioned_tables = None
+        queried_tables = None
+        distinct_queried_tables = None
+        if checks.isdisjoint(_TABLE_CHECKS):
+            return partitioned_tables, queried_tables, distinct_queried_tables
+        try:
+            # Resolve the referenced tables once, every lookup below matches the same ones
+            table_refs = functions.get_table_refs(ast, index)
+            if "partition_not_used" in checks:
+                partitioned_tables = functions.get_partitioned_tables(
+                    ast, columns_dict, table_index, table_refs
+                )
+            if "big_table_no_date" in checks or "unpartitioned_tables" in checks:
+                queried_tables = functions.get_queried_tables(
+                    ast, columns_dict, thresholds.large_table_row_count, table_index, table_refs
+                )
+            if "distinct_on_big_table" in checks or "count_distinct_on_big_table" in checks:
+                if (
+                    queried_tables is not None
+                    and thresholds.distinct_function_row_count == thresholds.large_table_row_count
+                ):
+                    distinct_queried_tables = queried_tables
+                else:
+                    distinct_queried_tables = functions.get_queried_tables(
+                        ast,
+                        columns_dict,
+                        thresholds.distinct_function_row_count,
+                        table_index,
+                        table_refs,
+                    )
+        except Exception as e:
+            print(f"Error resolving statement tables: {e!s}")
+        return partitioned_tables, queried_tables, distinct_queried_tables
+
+    def check_statement(
+        self,
+        statement: str,
+        columns_dict: dict[str, Any],
+        config: Config,
+        checks: frozenset[str],
+        table_index: functions.TableIndex | None = None,
+    ) -> dict[str, Any]:
+        """Run the given antipattern checks on a single SQL statement.
+
+        The results only depend on the statement and the checks run, not on the
+        job, so jobs repeating a statement can share them. A check that fails is
+        reported and left out of the results.
+
+        Args:
+            statement: SQL statement text
+            columns_dict: Dictionary of table metadata from get_columns_dict()
+            config: Configuration deciding which antipatterns are enabled
+            checks: Names of the checks to run
+            table_index: Optional TableIndex over columns_dict to match table names faster
+
+        Returns:
+            dict: Results by antipattern name, a (flag, tables) tuple for table checks
+        """
+        results: dict[str, Any] = {}
+        # Looked up once here rather than for each of the checks below
+        antipatterns = self.antipatterns
+        # Parse and walk the tree once and let every check look up the nodes it needs
+        ast, index = _parse_cached(statement)
+        if exp.UserDefinedFunction in index or exp.SetItem in index:
+            return results
+
+        # Resolve table metadata once per statement and share it between checks
+        partitioned_tables, queried_tables, distinct_queried_tables = self.get_statement_tables(
+            ast, columns_dict, config, table_index, index, checks=checks
+        )
+
+        # Check partition usage
+        if "partition_not_used" in checks:
+            try:
+                results["partition_not_used"] = antipatterns.check_partition_used(
+                    ast, columns_dict, index, partitioned_tables
+                )
+            except Exception as e:
+                print(f"Error in check_partition_used: {e!s}")
+
+        # Both date checks share one walk of the date comparisons. If that
+        # fails they run separately, so one check's error can't hide the other
+        check_big_date_range = "big_date_range" in checks
+        check_big_table_no_date = "big_table_no_date" in checks
+        date_filters = None
+        if check_big_date_range and check_big_table_no_date:
+            try:
+                date_filters = antipatterns.check_date_filters(
+                    ast, columns_dict, index, queried_tables
+                )
+            except Exception:
+                date_filters = None
+
+        # Check big date range
+        if check_big_date_range:
+            try:
+                if date_filters:
+                    results["big_date_range"] = date_filters[0]
+                else:
+                    results["big_date_range"] = antipatterns.check_big_date_range(ast, index)
+            except Exception as e:
+                print(f"Error in check_big_date_range: {e!s}")
+
+        # Check big table without date filter
+        if check_big_table_no_date:
+            try:
+                if date_filters:
+                    results["big_table_no_date"] = date_filters[1:]
+                else:
+                    results["big_table_no_date"] = antipatterns.check_big_table_no_date(
+                        ast, columns_dict, index, queried_tables
+                    )
+            except Exception as e:
+                print(f"Error in check_big_table_no_date: {e!s}")
+
+        # Checks that only need the statement's AST and node index
+        for name, method_name in _AST_CHECKS:
+            if name in checks:
+                try:
+                    results[name] = getattr(antipatterns, method_name)(ast, index)
+                except Exception as e:
+                    print(f"Error in {method_name}: {e!s}")
+
+        # Check like before more selective, reusing the REGEXP search of the WHERE clause
+        if "like_before_more_selective" in checks:
+            try:
+                results["like_before_more_selective"] = (
+                    antipatterns.check_like_before_more_selective(
+                        ast, index, has_regexp=results.get("regexp_in_where")
+                    )
+                )
+            except Exception as e:
+                print(f"Error in check_like_before_more_selective: {e!s}")
+
+        # Check order without limit
+        if "order_without_limit" in checks:
+            try:
+                results["order_without_limit"] = antipatterns.check_order_without_limit(ast)
+            except Exception as e:
+                print(f"Error in check_order_without_limit: {e!s}")
+
+        # Check unpartitioned tables
+        if "unpartitioned_tables" in checks:
+            try:
+                results["unpartitioned_tables"] = antipatterns.check_unpartitioned_tables(
+                    ast, columns_dict, queried_tables
+                )
+            except Exception as e:
+                print(f"Error in check_unpartitioned_tables: {e!s}")
+
+        # Check distinct on big table
+        if "distinct_on_big_table" in checks:
+            try:
+                results["distinct_on_big_table"] = antipatterns.check_distinct_on_big_table(
+                    ast, columns_dict, index, distinct_queried_tables
+                )
+            except Exception as e:
+                print(f"Error in check_distinct_on_big_table: {e!s}")
+
+        # Check count distinct on big table
+        if "count_distinct_on_big_table" in checks:
+            try:
+                results["count_distinct_on_big_table"] = (
+                    antipatterns.check_count_distinct_on_big_table(
+                        ast, columns_dict, index, distinct_queried_tables
+                    )
+                )
+            except Exception as e:
+                print(f"Error in check_count_distinct_on_big_table: {e!s}")
+
+        return results
 
     def check_antipatterns(
-        self, columns_dict: dict[str, Any], config: Config | None = None
+        self,
+        columns_dict: dict[str, Any],
+        config: Config | None = None,
+        table_index: functions.TableIndex | None = None,
+        statement_cache: dict[tuple[str, frozenset[str]], dict[str, Any]] | None = None,
     ) -> None:
         """
         Check antipatterns based on the provided configuration.
         If no config is provided, checks all antipatterns (backwards compatibility).
+        Pass a functions.TableIndex built once over columns_dict to speed up table lookups,
+        and a dict shared by the jobs of a run as statement_cache to check each distinct
+        statement once, a StatementCache to bound its size. The cache is only valid for one
+        columns_dict and config. Without one, a statement repeated within the job is still
+        only checked once.
         """
-        # For backwards compatibility, if no config is provided, check all antipatterns
+        # For backwards compatibility, if no config is provided, check all antipatterns.
+        # The default config is built once per process rather than for every job
         if config is None:
-            config = Config.from_env()
+            config = get_default_config()
+        if statement_cache is None:
+            statement_cache = {}
+
+        # Tables can be reported by several statements, collect them once each and
+        # only fall back to the "-" placeholder when no statement reported any
+        found_partitions: set[tuple[tuple[str, str], ...]] = set()
+        found_tables_without_date_filter: set[str] = set()
+        found_unpartitioned_tables: set[str] = set()
+
+        # Decided once per job, then narrowed as statements set boolean flags
+        checks = self.get_pending_checks(config)
 
         statements = self.get_statements()
         for i in statements:
             try:
                 if "declare" not in i.lower():
-                    ast = parse_one(i, dialect="bigquery")
-
-                    if not ast.find(exp.UserDefinedFunction) and not ast.find(exp.SetItem):
-                        # Check partition usage
-                        if config.is_antipattern_enabled("partition_not_used"):
-                            try:
-                                partition_not_used, available_partitions = (
-                                    self.antipatterns.check_partition_used(ast, columns_dict)
-                                )
-                                if partition_not_used:
-                                    self.partition_not_used = partition_not_used
-                                    self.available_partitions += available_partitions
-                                    self.available_partitions = [
-                                        dict(t)
-                                        for t in {
-                                            tuple(d.items()) for d in self.available_partitions
-                                        }
-                                    ]
-                                else:
-                                    self.available_partitions = [
-                                        {"table_name": "-", "partitioned_column": "-"}
-                                    ]
-                            except Exception as e:
-                                print(f"Error in check_partition_used: {e!s}")
-
-                        # Check big date range
-                        if config.is_antipattern_enabled("big_date_range"):
-                            try:
-                                big_date_range = self.antipatterns.check_big_date_range(ast)
-                                self.big_date_range = big_date_range
-                            except Exception as e:
-                                print(f"Error in check_big_date_range: {e!s}")
-
-                        # Check big table without date filter
-                        if config.is_antipattern_enabled("big_table_no_date"):
-                            try:
-                                no_date_on_big_table, tables_without_date_filter = (
-                                    self.antipatterns.check_big_table_no_date(ast, columns_dict)
-                                )
-                                if no_date_on_big_table:
-                                    self.no_date_on_big_table = no_date_on_big_table
-                                    self.tables_without_date_filter += tables_without_date_filter
-                                else:
-                                    self.tables_without_date_filter = ["-"]
-                            except Exception as e:
-                                print(f"Error in check_big_table_no_date: {e!s}")
-
-                        # Check select star
-                        if config.is_antipattern_enabled("select_star"):
-                            try:
-                                # A job can have multiple SELECT statements executed. One case is enough to flag as True, hence max function
-                                self.select_star = max(
-                                    self.antipatterns.check_select_star(ast), self.select_star
-                                )
-                            except Exception as e:
-                                print(f"Error in check_select_star: {e!s}")
-
-                        # Check multiple CTE references
-                        if config.is_antipattern_enabled("multiple_cte_reference"):
-                            try:
-                                references_cte_multiple_times = (
-                                    self.antipatterns.check_multiple_cte_reference(ast)
-                                )
-                                self.references_cte_multiple_times = max(
-                                    references_cte_multiple_times,
-                                    self.references_cte_multiple_times,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_multiple_cte_reference: {e!s}")
-
-                        # Check semi join without aggregation
-                        if config.is_antipattern_enabled("semi_join_without_aggregation"):
-                            try:
-                                self.semi_join_without_aggregation = max(
-                                    self.antipatterns.check_semi_join_without_aggregation(ast),
-                                    self.semi_join_without_aggregation,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_semi_join_without_aggregation: {e!s}")
-
-                        # Check order without limit
-                        if config.is_antipattern_enabled("order_without_limit"):
-                            try:
-                                self.order_without_limit = max(
-                                    self.antipatterns.check_order_without_limit(ast),
-                                    self.order_without_limit,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_order_without_limit: {e!s}")
-
-                        # Check like before more selective
-                        if config.is_antipattern_enabled("like_before_more_selective"):
-                            try:
-                                self.like_before_more_selective = max(
-                                    self.antipatterns.check_like_before_more_selective(ast),
-                                    self.like_before_more_selective,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_like_before_more_selective: {e!s}")
-
-                        # Check regexp in where
-                        if config.is_antipattern_enabled("regexp_in_where"):
-                            try:
-                                self.regexp_in_where = max(
-                                    self.antipatterns.check_regexp_in_where(ast),
-                                    self.regexp_in_where,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_regexp_in_where: {e!s}")
-
-                        # Check unpartitioned tables
-                        if config.is_antipattern_enabled("unpartitioned_tables"):
-                            try:
-                                queries_unpartitioned_table, unpartitioned_tables = (
-                                    self.antipatterns.check_unpartitioned_tables(ast, columns_dict)
-                                )
-                                self.queries_unpartitioned_table = max(
-                                    queries_unpartitioned_table, self.queries_unpartitioned_table
-                                )
-                                self.unpartitioned_tables += (
-                                    unpartitioned_tables
-                                    if self.queries_unpartitioned_table
-                                    else ["-"]
-                                )
-                            except Exception as e:
-                                print(f"Error in check_unpartitioned_tables: {e!s}")
-
-                        # Check distinct on big table
-                        if config.is_antipattern_enabled("distinct_on_big_table"):
-                            try:
-                                self.distinct_on_big_table = max(
-                                    self.antipatterns.check_distinct_on_big_table(
-                                        ast, columns_dict
-                                    ),
-                                    self.distinct_on_big_table,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_distinct_on_big_table: {e!s}")
-
-                        # Check count distinct on big table
-                        if config.is_antipattern_enabled("count_distinct_on_big_table"):
-                            try:
-                                self.count_distinct_on_big_table = max(
-                                    self.antipatterns.check_count_distinct_on_big_table(
-                                        ast, columns_dict
-                                    ),
-                                    self.count_distinct_on_big_table,
-                                )
-                            except Exception as e:
-                                print(f"Error in check_count_distinct_on_big_table: {e!s}")
+                    key = (i, checks)
+                    try:
+                        results = statement_cache[key]
+                    except KeyError:
+                        results = self.check_statement(i, columns_dict, config, checks, table_index)
+                        statement_cache[key] = results
+
+                    if "partition_not_used" in results:
+                        partition_not_used, available_partitions = results["partition_not_used"]
+                        if partition_not_used:
+                            self.partition_not_used = partition_not_used
+                            found_partitions.update(tuple(d.items()) for d in available_partitions)
+                        else:
+                            self.available_partitions = [
+                                {"table_name": "-", "partitioned_column": "-"}
+                            ]
+
+                    if "big_table_no_date" in results:
+                        no_date_on_big_table, tables_without_date_filter = results[
+                            "big_table_no_date"
+                        ]
+                        if no_date_on_big_table:
+                            self.no_date_on_big_table = no_date_on_big_table
+                            found_tables_without_date_filter.update(tables_without_date_filter)
+                        else:
+                            self.tables_without_date_filter = ["-"]
+
+                    if "unpartitioned_tables" in results:
+                        queries_unpartitioned_table, unpartitioned_tables = results[
+                            "unpartitioned_tables"
+                        ]
+                        if queries_unpartitioned_table:
+                            self.queries_unpartitioned_table = True
+                            found_unpartitioned_tables.update(unpartitioned_tables)
+                        else:
+                            self.unpartitioned_tables = ["-"]
+
+                    flagged = [name for name in _FLAG_ATTRIBUTES if results.get(name)]
+                    for name, attr in _FLAG_ATTRIBUTES.items():
+                        if name in results:
+                            setattr(self, attr, results[name])
+                    if flagged:
+                        checks = checks.difference(flagged)
 
             except Exception as e:
                 print(f"Error processing statement: {e!s}")
+
+        if found_partitions:
+            self.available_partitions = [dict(t) for t in sorted(found_partitions)]
+        if found_tables_without_date_filter:
+            self.tables_without_date_filter = sorted(found_tables_without_date_filter)
+        if found_unpartitioned_tables:
+            self.unpartitioned_tables = sorted(found_unpartitioned_tables)
+
+
+# Output columns of Job.to_dict(), read with one attrgetter call per job
+JOB_OUTPUT_FIELDS = tuple(name for name in Job.__slots__ if name != "antipatterns")
+_get_job_output_values = attrgetter(*JOB_OUTPUT_FIELDS)
+
+
+def _init_worker(columns_dict: dict[str, Any], config: Config | None) -> None:
+    """Store the read-only batch inputs in the worker process."""
+    _WORKER_STATE["columns_dict"] = columns_dict
+    _WORKER_STATE["config"] = config
+    _WORKER_STATE["table_index"] = functions.TableIndex(columns_dict)
+    _WORKER_STATE["statement_cache"] = StatementCache()
+
+
+def _run_one_job(job: Job) -> Job:
+    """Check a single job inside a worker process and return it with its results."""
+    job.check_antipatterns(
+        _WORKER_STATE["columns_dict"],
+        _WORKER_STATE["config"],
+        _WORKER_STATE["table_index"],
+        _WORKER_STATE["statement_cache"],
+    )
+    return job
+
+
+def _gil_disabled() -> bool:
+    """Return whether this is a free-threaded interpreter running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _chunksize(jobs: Iterable[Job], workers: int | None) -> int:
+    """Jobs sent to a worker process at a time, about 8 chunks per worker for known sizes."""
+    if not isinstance(jobs, Sized):
+        return 16
+    return max(1, len(jobs) // (8 * (workers or os.cpu_count() or 1)))
+
+
+def analyze_batch(
+    jobs: Iterable[Job],
+    columns_dict: dict[str, Any],
+    config: Config | None = None,
+    workers: int | None = None,
+) -> list[Job]:
+    """Check antipatterns for a batch of jobs across worker processes.
+
+    Jobs are independent and columns_dict is read-only, so it is sent to each
+    worker once through the pool initializer rather than with every job. Jobs
+    are sent in chunks sized to give each worker about 8 of them.
+    On a free-threaded interpreter without the GIL, worker threads are used
+    instead, sharing the parse and statement caches without pickling jobs.
+    Callers on spawn based platforms must run this under an
+    ``if __name__ == "__main__":`` guard.
+
+    Args:
+        jobs: Jobs to check
+        columns_dict: Dictionary of table metadata from get_columns_dict()
+        config: Configuration deciding which antipatterns are enabled
+        workers: Number of worker processes (or threads), defaults to the CPU count.
+            With 1 the jobs are checked in the current process.
+
+    Returns:
+        list: The checked jobs, in the order they were given
+    """
+    if workers == 1:
+        table_index = functions.TableIndex(columns_dict)
+        statement_cache = StatementCache()
+        checked = []
+        for job in jobs:
+            job.check_antipatterns(columns_dict, config, table_index, statement_cache)
+            checked.append(job)
+        return checked
+
+    if _gil_disabled():
+        table_index = functions.TableIndex(columns_dict)
+        statement_cache = StatementCache()
+
+        def run_one_job(job: Job) -> Job:
+            job.check_antipatterns(columns_dict, config, table_index, statement_cache)
+            return job
+
+        with ThreadPoolExecutor(max_workers=workers) as thread_executor:
+            return list(thread_executor.map(run_one_job, jobs))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(columns_dict, config)
+    ) as executor:
+        return list(executor.map(_run_one_job, jobs, chunksize=_chunksize(jobs, workers)))
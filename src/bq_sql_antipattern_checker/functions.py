@@ -18,11 +18,18 @@ Example:
 
     Upload results to BigQuery:
 
-    >>> push_df_to_bq(results_df, config)
+    >>> push_results_to_bq(records, config)
 """
 
+import re
+import sys
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterable, Iterator
+from functools import cache, lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import pandas as pd
 from google.cloud import bigquery
@@ -31,26 +38,157 @@ from sqlglot import exp
 
 from bq_sql_antipattern_checker.config import Config
 
+NodeIndex = dict[type, list[exp.Expression]]
+TableRefs = tuple[list[tuple[str, str | None]], list[tuple[str, str | None]]]
+E = TypeVar("E", bound=exp.Expression)
+TableSummary = tuple[int, str | None, list[str], int, str | None]
+
+
+@lru_cache(maxsize=16)
+def _load_template(name: str) -> Template:
+    """Compile a SQL template from the package templates folder, once per template.
+
+    Templates are compiled on first use rather than at import, so processes that
+    never query BigQuery, like batch workers, don't pay for them.
+    """
+    # Template.__new__ is untyped, the annotation keeps the return type checked
+    template: Template = Template((Path(__file__).parent / "templates" / name).read_text())
+    return template
+
+
+# SQL template files
+_JOBS_QUERY_RAW_TEMPLATE = "jobs_query_raw.sql.j2"
+_JOBS_QUERY_TEMPLATE = "jobs_query.sql.j2"
+_METADATA_COLUMN_INFO_TEMPLATE = "metadata_column_info.sql.j2"
+_METADATA_ROW_COUNT_TEMPLATE = "metadata_row_count.sql.j2"
+_INFORMATION_SCHEMA_QUERY_TEMPLATE = "information_schema_query.sql.j2"
+
+_DOTTED_NAME_RE = re.compile(r"(\w+)`?\s*\.")
+
+# Output table columns, in Job.to_dict() order; matches templates/results_table_ddl.sql.j2
+RESULTS_SCHEMA = [
+    bigquery.SchemaField("job_id", "STRING"),
+    bigquery.SchemaField("creation_date", "DATE"),
+    bigquery.SchemaField("creation_time", "STRING"),
+    bigquery.SchemaField("project_id", "STRING"),
+    bigquery.SchemaField("user_email", "STRING"),
+    bigquery.SchemaField("reservation_id", "STRING"),
+    bigquery.SchemaField("total_process_gb", "FLOAT64"),
+    bigquery.SchemaField("total_slot_hrs", "FLOAT64"),
+    bigquery.SchemaField("total_duration_mins", "FLOAT64"),
+    bigquery.SchemaField("query", "STRING"),
+    bigquery.SchemaField("partition_not_used", "BOOL"),
+    bigquery.SchemaField(
+        "available_partitions",
+        "STRUCT",
+        mode="REPEATED",
+        fields=[
+            bigquery.SchemaField("partitioned_column", "STRING"),
+            bigquery.SchemaField("table_name", "STRING"),
+        ],
+    ),
+    bigquery.SchemaField("big_date_range", "BOOL"),
+    bigquery.SchemaField("no_date_on_big_table", "BOOL"),
+    bigquery.SchemaField("tables_without_date_filter", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("select_star", "BOOL"),
+    bigquery.SchemaField("references_cte_multiple_times", "BOOL"),
+    bigquery.SchemaField("semi_join_without_aggregation", "BOOL"),
+    bigquery.SchemaField("order_without_limit", "BOOL"),
+    bigquery.SchemaField("like_before_more_selective", "BOOL"),
+    bigquery.SchemaField("regexp_in_where", "BOOL"),
+    bigquery.SchemaField("queries_unpartitioned_table", "BOOL"),
+    bigquery.SchemaField("unpartitioned_tables", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("distinct_on_big_table", "BOOL"),
+    bigquery.SchemaField("count_distinct_on_big_table", "BOOL"),
+    bigquery.SchemaField("antipattern_run_time", "STRING"),
+]
+RESULT_COLUMNS = [field.name for field in RESULTS_SCHEMA]
+
+# Built once and reused for every upload, the client copies it for each load job
+RESULTS_LOAD_JOB_CONFIG = bigquery.LoadJobConfig(
+    source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+    schema=RESULTS_SCHEMA,
+    write_disposition="WRITE_TRUNCATE",
+    time_partitioning=bigquery.TimePartitioning(
+        type_=bigquery.TimePartitioningType.DAY,
+        field="creation_date",  # field to use for partitioning
+    ),
+)
+
+
+@cache
+def _get_project_client(project: str) -> bigquery.Client:
+    """Create one BigQuery client per project and reuse it for every call."""
+    return bigquery.Client(project=project)
+
 
 def get_client(config: Config) -> bigquery.Client:
     """Get a BigQuery client instance.
 
+    Clients are cached per job project, so credential discovery and the HTTP
+    session setup only happen once per run.
+
     Args:
         config: Configuration object containing BigQuery settings
 
     Returns:
         bigquery.Client: Authenticated BigQuery client for the configured project.
     """
-    return bigquery.Client(project=config.bigquery_job_project)
+    return _get_project_client(config.bigquery_job_project)
+
+
+def _build_jobs_query(config: Config, limit_row: int | None, cumul_perc: float | None) -> str:
+    """Render the INFORMATION_SCHEMA.JOBS query for every configured query project."""
+    # Generate queries for each query project and join with UNION ALL
+    jobs_raw_queries = [
+        _load_template(_JOBS_QUERY_RAW_TEMPLATE).render(
+            region=config.bigquery_region,
+            date=config.date_values["query_run_date_str"],
+            query_project=query_project,
+        )
+        for query_project in config.query_project
+    ]
+    return _load_template(_JOBS_QUERY_TEMPLATE).render(
+        jobs_query_raw="\n UNION ALL \n".join(jobs_raw_queries),
+        limit_row=limit_row,
+        cumul_perc=cumul_perc,
+    )
+
+
+def iter_jobs(
+    config: Config,
+    limit_row: int | None,
+    cumul_perc: float | None,
+    page_size: int = 10_000,
+) -> Iterator[dict[str, Any]]:
+    """Stream BigQuery jobs for a specific date and project.
+
+    Rows are yielded page by page as they arrive from BigQuery, as plain dicts
+    rather than a DataFrame. run_check collects them into a list, since the
+    tables the jobs reference are only known once every job has been read.
+
+    Args:
+        config: Configuration object containing BigQuery settings
+        limit_row: limit on the number of rows to return (None for no limit)
+        cumul_perc: limit number of jobs to top costing ones by their cumulative percentage of cost
+        page_size: Number of rows fetched per result page
+
+    Yields:
+        dict: Job metadata for one job
+    """
+    query_job = get_client(config).query(_build_jobs_query(config, limit_row, cumul_perc))
+    for row in query_job.result(page_size=page_size):
+        yield dict(row.items())
 
 
 def get_jobs_dict(
     config: Config, limit_row: int | None, cumul_perc: float | None
-) -> dict[str, Any]:
+) -> dict[int, dict[str, Any]]:
     """Retrieve BigQuery jobs for a specific date and project.
 
     Queries INFORMATION_SCHEMA.JOBS to get job metadata including SQL statements
-    for analysis. Uses a Jinja2 template to construct the query.
+    for analysis. Uses a Jinja2 template to construct the query. Prefer
+    iter_jobs() when the jobs are processed one at a time.
 
     Args:
         config: Configuration object containing BigQuery settings
@@ -58,44 +196,32 @@ def get_jobs_dict(
         cumul_perc: limit number of jobs to top costing ones by their cumulative percentage of cost
 
     Returns:
-        dict: Dictionary of jobs indexed by job ID, containing job metadata
+        dict: Dictionary of jobs indexed by row number, containing job metadata
     """
-    jobs_query_raw_template_path = Path(__file__).parent / "templates" / "jobs_query_raw.sql.j2"
-    jobs_query_template_path = Path(__file__).parent / "templates" / "jobs_query.sql.j2"
-    with open(jobs_query_raw_template_path) as file_:
-        template = Template(file_.read())
-    jobs_query_raw_ = template.render()
-    with open(jobs_query_template_path) as file_:
-        template = Template(file_.read())
-    jobs_query = template.render(limit_row=limit_row)
+    return dict(enumerate(iter_jobs(config, limit_row, cumul_perc)))
 
-    # Generate queries for each query project and join with UNION ALL
-    jobs_raw_queries = []
-    for query_project in config.query_project:
-        jobs_query_raw = jobs_query_raw_.format(
-            region=config.bigquery_region,
-            date=config.date_values["query_run_date_str"],
-            query_project=query_project,
-            bigquery_region=config.bigquery_region,
-            cumul_perc=cumul_perc,
-        )
-        jobs_raw_queries.append(jobs_query_raw)
 
-    final_jobs_query_raw = "\n UNION ALL \n".join(jobs_raw_queries)
-    jobs_query = jobs_query.format(
-        jobs_query_raw=final_jobs_query_raw,
-        cumul_perc=cumul_perc
-        )
-    query_job = get_client(config).query(jobs_query)
-    if query_job.result():
-        jobs_df = query_job.to_dataframe()
-        jobs_dict: dict = jobs_df.to_dict("index")
-        return jobs_dict
-    else:
-        return {}
+def get_referenced_datasets(queries: Iterable[str]) -> set[str]:
+    """Collect every name that can be a dataset in the given SQL texts.
 
+    A dataset in a table reference is always followed by a dot (dataset.table or
+    project.dataset.table, with or without backticks), so every dotted
+    identifier is kept. Column and alias prefixes are kept too, which makes the
+    result a superset: filtering metadata by it never drops a referenced table.
 
-def get_columns_dict(config: Config) -> dict[str, Any]:
+    Args:
+        queries: SQL texts of the jobs being checked
+
+    Returns:
+        set: Candidate dataset names
+    """
+    datasets: set[str] = set()
+    for query in queries:
+        datasets.update(_DOTTED_NAME_RE.findall(query))
+    return datasets
+
+
+def get_columns_dict(config: Config, datasets: Iterable[str] | None = None) -> dict[str, Any]:
     """Retrieve column and table metadata for large tables.
 
     Queries INFORMATION_SCHEMA to get table metadata including row counts,
@@ -104,62 +230,325 @@ def get_columns_dict(config: Config) -> dict[str, Any]:
 
     Args:
         config: Configuration object containing BigQuery settings
+        datasets: Only fetch metadata for tables in these datasets, e.g. from
+            get_referenced_datasets(). The filter is pushed into the
+            INFORMATION_SCHEMA queries as a parameter. None fetches every dataset.
 
     Returns:
         dict: Dictionary of table metadata indexed by full table name
 
     TODO: Add required BigQuery job labels
     """
-    column_template_path = Path(__file__).parent / "templates" / "metadata_column_info.sql.j2"
-    row_count_template_path = Path(__file__).parent / "templates" / "metadata_row_count.sql.j2"
-    information_schema_template_path = Path(__file__).parent / "templates" / "information_schema_query.sql.j2"
-    with open(column_template_path) as file_:
-        template = Template(file_.read())
-    column_query_= template.render()
-    with open(row_count_template_path) as file_:
-        template = Template(file_.read())
-    row_count_query_ = template.render()
-    with open(information_schema_template_path) as file_:
-        template = Template(file_.read())
-    information_schema_query = template.render()
+    if datasets is not None:
+        datasets = sorted(datasets)
+        if not datasets:
+            return {}
 
     # Generate queries for each information_schema_project and join with UNION ALL
     column_queries = []
     row_count_queries = []
     for information_schema_project in config.information_schema_project:
-        column_query = column_query_.format(
-            information_schema_project=information_schema_project,
-            bigquery_region=config.bigquery_region,
-            large_table_row_count=config.large_table_row_count,
+        template_values = {
+            "information_schema_project": information_schema_project,
+            "bigquery_region": config.bigquery_region,
+            "large_table_row_count": config.large_table_row_count,
+            "filter_datasets": datasets is not None,
+        }
+        column_queries.append(
+            _load_template(_METADATA_COLUMN_INFO_TEMPLATE).render(**template_values)
         )
-        column_queries.append(column_query)
-
-        row_count_query = row_count_query_.format(
-            information_schema_project=information_schema_project,
-            bigquery_region=config.bigquery_region,
-            large_table_row_count=config.large_table_row_count,
+        row_count_queries.append(
+            _load_template(_METADATA_ROW_COUNT_TEMPLATE).render(**template_values)
         )
-        row_count_queries.append(row_count_query)
 
-    metadata_column_query = "\n UNION ALL \n".join(column_queries)
-    metadata_row_count_query = "\n UNION ALL \n".join(row_count_queries)
+    information_schema_query = _load_template(_INFORMATION_SCHEMA_QUERY_TEMPLATE).render(
+        metadata_row_count_query="\n UNION ALL \n".join(row_count_queries),
+        metadata_column_query="\n UNION ALL \n".join(column_queries),
+    )
+
+    job_config = bigquery.QueryJobConfig()
+    if datasets is not None:
+        job_config.query_parameters = [bigquery.ArrayQueryParameter("datasets", "STRING", datasets)]
+    query_job = get_client(config).query(information_schema_query, job_config=job_config)
+    # Build the dict straight from the rows, without a DataFrame round trip
+    columns_dict: dict[str, Any] = {}
+    for row in query_job.result():
+        table_info = dict(row.items())
+        columns_dict[table_info.pop("full_table_name")] = table_info
+    return columns_dict
+
+
+def summarize_tables(columns_dict: dict[str, Any], table_list: list[str]) -> TableSummary | None:
+    """Aggregate the metadata of the tables a reference resolves to.
+
+    Row counts are summed over every matched table (e.g. the shards of a
+    wildcard), the other fields come from the last table in the list.
+
+    Args:
+        columns_dict: Dictionary of table metadata from get_columns_dict()
+        table_list: Matching full table names, in sorted order
 
-    information_schema_query = information_schema_query.format(
-        metadata_row_count_query=metadata_row_count_query,
-        metadata_column_query=metadata_column_query
+    Returns:
+        tuple: (total_rows, partitioned_column, datetime_columns,
+            datetime_column_count, table), or None when nothing matched
+    """
+    if not table_list:
+        return None
+    total_rows = 0
+    for k in table_list:
+        total_rows += columns_dict[k]["total_rows"]
+    last = columns_dict[table_list[-1]]
+    datetime_columns = last.get("datetime_columns")
+    return (
+        total_rows,
+        last.get("partitioned_column"),
+        datetime_columns,
+        len(datetime_columns),
+        last.get("table"),
     )
 
-    query_job = get_client(config).query(information_schema_query)
-    if query_job.result():
-        columns_df = query_job.to_dataframe()
-        columns_dict: dict[str, Any] = columns_df.set_index("full_table_name").to_dict("index")
-        return columns_dict
-    else:
-        return {}
+
+def matches_wildcard(pattern: str, table_name: str) -> bool:
+    """Check whether a wildcard table reference, without its *, covers a table.
+
+    Fully qualified patterns (project.dataset.prefix) match the tables starting
+    with them, shorter ones match the tables containing them anywhere.
+
+    Args:
+        pattern: Table reference with the * removed
+        table_name: Full table name from columns_dict
+
+    Returns:
+        bool: True if the table is one of the wildcard's tables
+    """
+    if pattern.count(".") >= 2:
+        return table_name.startswith(pattern)
+    return pattern in table_name
+
+
+class TableIndex:
+    """Lookup structure over get_columns_dict() output, built once per run.
+
+    Matching a table reference used to scan every columns_dict key. Exact names
+    are now dictionary lookups, fully qualified wildcards (project.dataset.prefix*)
+    a binary search over the sorted keys, and every wildcard is resolved once.
+    The summed shard metadata of each reference is cached as well, and so are the
+    queried and partitioned tables of each set of table references, which repeat
+    across the many jobs running the same statements.
+
+    Attributes:
+        columns_dict: Dictionary of table metadata from get_columns_dict()
+        sorted_keys: columns_dict keys in sorted order
+        statement_tables: get_queried_tables() and get_partitioned_tables() results
+            keyed by table references, shared between jobs so they must not be modified
+    """
+
+    def __init__(self, columns_dict: dict[str, Any]) -> None:
+        """Index the table names of a columns dictionary.
+
+        Args:
+            columns_dict: Dictionary of table metadata from get_columns_dict()
+        """
+        self.columns_dict = columns_dict
+        self.sorted_keys = sorted(columns_dict)
+        self._wildcard_matches: dict[str, list[str]] = {}
+        self._summaries: dict[str, TableSummary | None] = {}
+        self._partitioned_matches: dict[str, list[str]] = {}
+        self.statement_tables: dict[tuple[Any, ...], dict[str, dict[str, Any]]] = {}
+
+    def match(self, full_table_name: str) -> list[str]:
+        """Return the columns_dict keys a table reference resolves to, in sorted order.
+
+        Args:
+            full_table_name: Table name as referenced in the query, may end with *
+
+        Returns:
+            list: Matching full table names
+        """
+        if "*" not in full_table_name:
+            return [full_table_name] if full_table_name in self.columns_dict else []
+        pattern = full_table_name.replace("*", "")
+        matches = self._wildcard_matches.get(pattern)
+        if matches is None:
+            if pattern.count(".") >= 2:
+                # Fully qualified, the matching keys are a contiguous run of the sorted keys
+                matches = []
+                for k in islice(self.sorted_keys, bisect_left(self.sorted_keys, pattern), None):
+                    if not k.startswith(pattern):
+                        break
+                    matches.append(k)
+            else:
+                matches = [k for k in self.sorted_keys if matches_wildcard(pattern, k)]
+            self._wildcard_matches[pattern] = matches
+        return matches
+
+    def partitioned_match(self, full_table_name: str) -> list[str]:
+        """Return the partitioned tables among match(), computed once per reference.
+
+        Args:
+            full_table_name: Table name as referenced in the query, may end with *
+
+        Returns:
+            list: Matching full table names that have a partition column
+        """
+        matches = self._partitioned_matches.get(full_table_name)
+        if matches is None:
+            matches = [
+                k for k in self.match(full_table_name) if self.columns_dict[k]["partitioned_column"]
+            ]
+            self._partitioned_matches[full_table_name] = matches
+        return matches
+
+    def summary(self, full_table_name: str) -> TableSummary | None:
+        """Return summarize_tables() of a table reference, computed once per reference.
+
+        Args:
+            full_table_name: Table name as referenced in the query, may end with *
+
+        Returns:
+            tuple: (total_rows, partitioned_column, datetime_columns,
+                datetime_column_count, table), or None when nothing matched
+        """
+        if full_table_name not in self._summaries:
+            self._summaries[full_table_name] = summarize_tables(
+                self.columns_dict, self.match(full_table_name)
+            )
+        return self._summaries[full_table_name]
+
+
+@cache
+def _index_keys(node_type: type) -> tuple[type, ...]:
+    """Return the expression classes a node of the given type is indexed under.
+
+    A node is indexed under its own class and every expression base class, so
+    ``index[exp.Cast]`` also holds ``exp.TryCast`` nodes, matching ``find_all``.
+    """
+    return tuple(
+        t for t in node_type.__mro__ if issubclass(t, exp.Expression) and t is not exp.Expression
+    )
+
+
+def iter_typed(root: exp.Expression, *types: type[E]) -> Iterator[E]:
+    """Yield the nodes of the given types in the subtree rooted at ``root``.
+
+    Gives the same nodes in the same (BFS) order as ``root.find_all(*types)``, but
+    walks the children in a single loop rather than through sqlglot's chain of
+    generators, and only yields the matching nodes.
+
+    Args:
+        root: SQLGlot expression node to walk from, included in the walk
+        *types: Expression classes to yield
+
+    Yields:
+        exp.Expression: Matching nodes, breadth first
+    """
+    queue: deque[exp.Expression] = deque([root])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, types):
+            yield node
+        for value in node.args.values():
+            if type(value) is list:
+                queue.extend(v for v in value if isinstance(v, exp.Expression))
+            elif isinstance(value, exp.Expression):
+                queue.append(value)
+
+
+def index_ast(ast: exp.Expression) -> NodeIndex:
+    """Bucket every node of a SQL AST by expression type in a single walk.
+
+    The antipattern checks look up the nodes they need in this index instead of
+    re-traversing the whole tree with ``find_all`` for every node type.
+
+    Args:
+        ast: SQLGlot AST representing the parsed SQL query
+
+    Returns:
+        dict: Nodes keyed by expression type, in the same (BFS) order as ``find_all``
+    """
+    index: NodeIndex = {}
+    for node in iter_typed(ast, exp.Expression):
+        for node_type in _index_keys(type(node)):
+            index.setdefault(node_type, []).append(node)
+    return index
+
+
+def is_descendant(node: exp.Expression, ancestor: exp.Expression) -> bool:
+    """Check whether a node sits inside the subtree rooted at ``ancestor``.
+
+    Args:
+        node: SQLGlot expression node to check
+        ancestor: SQLGlot expression node expected higher up in the tree
+
+    Returns:
+        bool: True if ``ancestor`` is the node itself or one of its parents
+    """
+    current: exp.Expression | None = node
+    while current is not None:
+        if current is ancestor:
+            return True
+        current = current.parent
+    return False
+
+
+def outermost(nodes: list[exp.Expression]) -> list[exp.Expression]:
+    """Drop the nodes that sit inside the subtree of another node of the list.
+
+    Walking the subtrees of the remaining nodes visits every node under the
+    original list once, instead of once per enclosing clause (e.g. a FROM in a
+    subquery of another FROM).
+
+    Args:
+        nodes: SQLGlot expression nodes of the same tree
+
+    Returns:
+        list: The nodes without an ancestor in the list, in their original order
+    """
+    node_ids = {id(n) for n in nodes}
+    result = []
+    for n in nodes:
+        parent = n.parent
+        while parent is not None and id(parent) not in node_ids:
+            parent = parent.parent
+        if parent is None:
+            result.append(n)
+    return result
+
+
+def get_table_refs(ast: exp.Expression, index: NodeIndex | None = None) -> TableRefs:
+    """Resolve the dataset qualified tables referenced in FROM and JOIN clauses.
+
+    Done once per statement so get_queried_tables and get_partitioned_tables
+    don't each walk the clauses and rebuild the table names. Nested clauses are
+    covered by the walk of their outermost clause, so each table is resolved once.
+
+    Args:
+        ast: SQLGlot AST representing the parsed SQL query
+        index: Optional node index of the AST from index_ast()
+
+    Returns:
+        tuple: (from_refs, join_refs), lists of (full_table_name, alias) per clause
+    """
+    if index is None:
+        index = index_ast(ast)
+    from_refs: list[tuple[str, str | None]] = []
+    join_refs: list[tuple[str, str | None]] = []
+    for refs, clause_type in ((from_refs, exp.From), (join_refs, exp.Join)):
+        for c in outermost(index.get(clause_type, [])):
+            for t in iter_typed(c, exp.Table):
+                # Tables without a dataset, such as CTE names, have no full name
+                full_table_name, alias = get_alias_and_table_name_from_table(t)
+                if full_table_name is not None:
+                    refs.append((full_table_name, alias))
+    return from_refs, join_refs
 
 
 def get_queried_tables(
-    ast: exp.Expression, columns_dict: dict[str, Any], row_count: int
+    ast: exp.Expression,
+    columns_dict: dict[str, Any],
+    row_count: int,
+    table_index: TableIndex | None = None,
+    table_refs: TableRefs | None = None,
 ) -> dict[str, dict[str, Any]]:
     """Extract queried table information from SQL AST.
 
@@ -170,59 +559,78 @@ def get_queried_tables(
         ast: SQLGlot AST representing the parsed SQL query
         columns_dict: Dictionary of table metadata from get_columns_dict()
         row_count: Minimum row count for a table to be considered
+        table_index: Optional TableIndex over columns_dict to match table names faster
+        table_refs: Optional table references of the AST from get_table_refs()
 
     Returns:
         dict: Dictionary of queried table metadata with aliases resolved
     """
-    queried_tables = {}
-    if len(list(ast.find_all(exp.Join))) > 0 or len(list(ast.find_all(exp.From))) > 0:
-        for c in list(ast.find_all(exp.Join)) + list(ast.find_all(exp.From)):
-            for t in c.find_all(exp.Table):
-                if t.args.get("db"):
-                    full_table_name, alias = get_alias_and_table_name_from_table(t)
-                    if "*" in full_table_name:
-                        table_list = [
-                            k for k in columns_dict.keys() if full_table_name.replace("*", "") in k
-                        ]
-                    else:
-                        table_list = [k for k in columns_dict.keys() if full_table_name == k]
-                    if len(table_list) > 0:
-                        table_list.sort()
-                        total_rows = 0
-                        for k in table_list:
-                            total_rows += columns_dict[k]["total_rows"]
-                            partitioned_column = columns_dict[k].get("partitioned_column")
-                            available_datetime_columns = len(
-                                columns_dict[k].get("datetime_columns")
-                            )
-                            available_datetime_columns_list = columns_dict[k].get(
-                                "datetime_columns"
-                            )
-                            table = columns_dict[k].get("table")
-                        if full_table_name not in queried_tables and total_rows >= row_count:
-                            queried_tables[full_table_name] = {
-                                "full_table_name": full_table_name,
-                                "total_rows": total_rows,
-                                "partitioned_column": partitioned_column,
-                                "available_datetime_columns": available_datetime_columns,
-                                "available_datetime_columns_list": available_datetime_columns_list,
-                                "is_alias": False,
-                                "table": table,
-                            }
-                        if alias:
-                            if alias not in queried_tables and total_rows >= row_count:
-                                queried_tables[alias] = {
-                                    "full_table_name": full_table_name,
-                                    "total_rows": total_rows,
-                                    "partitioned_column": partitioned_column,
-                                    "available_datetime_columns": available_datetime_columns,
-                                    "available_datetime_columns_list": available_datetime_columns_list,
-                                    "is_alias": True,
-                                    "table": table,
-                                }
+    if table_refs is None:
+        table_refs = get_table_refs(ast)
+    from_refs, join_refs = table_refs
+    if table_index is not None:
+        key = ("queried", row_count, tuple(from_refs), tuple(join_refs))
+        cached = table_index.statement_tables.get(key)
+        if cached is not None:
+            return cached
+    queried_tables: dict[str, dict[str, Any]] = {}
+    for full_table_name, alias in chain(join_refs, from_refs):
+        if table_index is not None:
+            summary = table_index.summary(full_table_name)
+        else:
+            if "*" in full_table_name:
+                pattern = full_table_name.replace("*", "")
+                table_list = sorted(k for k in columns_dict.keys() if matches_wildcard(pattern, k))
+            else:
+                table_list = [k for k in columns_dict.keys() if full_table_name == k]
+            summary = summarize_tables(columns_dict, table_list)
+        if summary is not None:
+            (
+                total_rows,
+                partitioned_column,
+                available_datetime_columns_list,
+                available_datetime_columns,
+                table,
+            ) = summary
+            if full_table_name not in queried_tables and total_rows >= row_count:
+                queried_tables[full_table_name] = {
+                    "full_table_name": full_table_name,
+                    "total_rows": total_rows,
+                    "partitioned_column": partitioned_column,
+                    "available_datetime_columns": available_datetime_columns,
+                    "available_datetime_columns_list": available_datetime_columns_list,
+                    "is_alias": False,
+                    "table": table,
+                }
+            if alias:
+                if alias not in queried_tables and total_rows >= row_count:
+                    queried_tables[alias] = {
+                        "full_table_name": full_table_name,
+                        "total_rows": total_rows,
+                        "partitioned_column": partitioned_column,
+                        "available_datetime_columns": available_datetime_columns,
+                        "available_datetime_columns_list": available_datetime_columns_list,
+                        "is_alias": True,
+                        "table": table,
+                    }
+    if table_index is not None:
+        table_index.statement_tables[key] = queried_tables
     return queried_tables
 
 
+def get_table_alias(table: exp.Table) -> str | None:
+    """Extract the alias name of a SQLGlot Table node.
+
+    Args:
+        table: SQLGlot Table expression node
+
+    Returns:
+        str: The alias, or None for a table without one
+    """
+    alias_ref = table.args.get("alias")
+    return alias_ref.args.get("this").args.get("this") if alias_ref else None
+
+
 def get_alias_and_table_name_from_table(table: exp.Table) -> tuple[str | None, str | None]:
     """Extract table name and alias from SQLGlot Table node.
 
@@ -232,24 +640,17 @@ def get_alias_and_table_name_from_table(table: exp.Table) -> tuple[str | None, s
     Returns:
         tuple: (full_table_name, alias) where alias may be None
     """
-    full_table_name = None
-    alias = None
-    if table.args.get("db"):
-        table_name = table.args.get("this").args.get("this")
-        full_table_name = str(table_name)
-        if table.args.get("db"):
-            dataset = table.args.get("db").args.get("this")
-            full_table_name = dataset + "." + full_table_name
-        if table.args.get("catalog"):
-            project = table.args.get("catalog").args.get("this")
-            full_table_name = project + "." + full_table_name
-        alias = (
-            table.args.get("alias").args.get("this").args.get("this")
-            if table.args.get("alias")
-            else None
-        )
-
-    return full_table_name, alias
+    # Bind the args dicts once, these helpers run for every table and column reference
+    args = table.args
+    db = args.get("db")
+    if not db:
+        return None, None
+    full_table_name = db.args.get("this") + "." + str(args.get("this").args.get("this"))
+    catalog = args.get("catalog")
+    if catalog:
+        full_table_name = catalog.args.get("this") + "." + full_table_name
+    # Jobs reference the same tables over and over, keep one copy of each name
+    return sys.intern(full_table_name), get_table_alias(table)
 
 
 def get_column_and_table_name_from_column(column: exp.Column) -> tuple[str | None, str | None]:
@@ -261,18 +662,19 @@ def get_column_and_table_name_from_column(column: exp.Column) -> tuple[str | Non
     Returns:
         tuple: (column_name, table_name) where table_name may be None
     """
-    this_ref = column.args.get("this")
+    args = column.args
+    this_ref = args.get("this")
     column_name = this_ref.args.get("this") if this_ref else None
     table_name = None
 
-    table_ref = column.args.get("table")
+    table_ref = args.get("table")
     if table_ref:
-        table_name_val = table_ref.args.get("this")
-        if table_name_val:
-            table_name = str(table_name_val)
+        table_val = table_ref.args.get("this")
+        if table_val:
+            table_name = str(table_val)
 
-        db_ref = column.args.get("db")
-        catalog_ref = column.args.get("catalog")
+        db_ref = args.get("db")
+        catalog_ref = args.get("catalog")
 
         if db_ref and not catalog_ref:
             db_val = db_ref.args.get("this")
@@ -282,16 +684,18 @@ def get_column_and_table_name_from_column(column: exp.Column) -> tuple[str | Non
         if catalog_ref:
             catalog_val = catalog_ref.args.get("this")
             db_val = db_ref.args.get("this") if db_ref else None
-            table_val = table_ref.args.get("this")
 
             if catalog_val and db_val and table_val:
-                table_name = f"{catalog_val}.{db_val}.{table_val}"
+                table_name = sys.intern(f"{catalog_val}.{db_val}.{table_val}")
 
     return column_name, table_name
 
 
 def get_partitioned_tables(
-    ast: exp.Expression, columns_dict: dict[str, Any]
+    ast: exp.Expression,
+    columns_dict: dict[str, Any],
+    table_index: TableIndex | None = None,
+    table_refs: TableRefs | None = None,
 ) -> dict[str, dict[str, Any]]:
     """Find partitioned tables referenced in the SQL query.
 
@@ -301,81 +705,90 @@ def get_partitioned_tables(
     Args:
         ast: SQLGlot AST representing the parsed SQL query
         columns_dict: Dictionary of table metadata including partition info
+        table_index: Optional TableIndex over columns_dict to match table names faster
+        table_refs: Optional table references of the AST from get_table_refs()
 
     Returns:
         dict: Dictionary of partitioned tables with metadata
     """
-    used_tables_with_partition = {}
-    partitioned_tables = [k for k in columns_dict.keys() if columns_dict[k]["partitioned_column"]]
-    if len(list(ast.find_all(exp.From)) + list(ast.find_all(exp.Join))) > 0:
-        for i in list(ast.find_all(exp.From)) + list(ast.find_all(exp.Join)):
-            for t in i.find_all(exp.Table):
-                if t.args.get("db"):
-                    full_table_name, alias = get_alias_and_table_name_from_table(t)
-                    for k in partitioned_tables:
-                        if full_table_name and "*" in full_table_name:
-                            if full_table_name.replace("*", "") in k:
-                                if full_table_name not in used_tables_with_partition:
-                                    used_tables_with_partition[full_table_name] = {
-                                        "full_table_name": full_table_name,
-                                        "qualified": True,
-                                        "alias": alias,
-                                        "partition_column": columns_dict[k]["partitioned_column"],
-                                    }
-                                if alias:
-                                    if alias not in used_tables_with_partition:
-                                        used_tables_with_partition[alias] = {
-                                            "full_table_name": full_table_name,
-                                            "qualified": False,
-                                            "alias": alias,
-                                            "partition_column": columns_dict[k][
-                                                "partitioned_column"
-                                            ],
-                                        }
-                                break
-                        elif full_table_name and full_table_name == k:
-                            if full_table_name not in used_tables_with_partition:
-                                used_tables_with_partition[full_table_name] = {
-                                    "full_table_name": full_table_name,
-                                    "qualified": True,
-                                    "alias": alias,
-                                    "partition_column": columns_dict[k]["partitioned_column"],
-                                }
-                            if alias:
-                                if alias not in used_tables_with_partition:
-                                    used_tables_with_partition[alias] = {
-                                        "full_table_name": full_table_name,
-                                        "qualified": False,
-                                        "alias": alias,
-                                        "partition_column": columns_dict[k]["partitioned_column"],
-                                    }
+    if table_refs is None:
+        table_refs = get_table_refs(ast)
+    from_refs, join_refs = table_refs
+    if table_index is not None:
+        key = ("partitioned", tuple(from_refs), tuple(join_refs))
+        cached = table_index.statement_tables.get(key)
+        if cached is not None:
+            return cached
+    else:
+        partitioned_tables = [
+            k for k in columns_dict.keys() if columns_dict[k]["partitioned_column"]
+        ]
+    used_tables_with_partition: dict[str, dict[str, Any]] = {}
+    for full_table_name, alias in chain(from_refs, join_refs):
+        if table_index is not None:
+            # Only the matching tables can be reported, in place of scanning every table
+            partitioned_tables = table_index.partitioned_match(full_table_name)
+        for k in partitioned_tables:
+            if full_table_name and "*" in full_table_name:
+                if matches_wildcard(full_table_name.replace("*", ""), k):
+                    if full_table_name not in used_tables_with_partition:
+                        used_tables_with_partition[full_table_name] = {
+                            "full_table_name": full_table_name,
+                            "qualified": True,
+                            "alias": alias,
+                            "partition_column": columns_dict[k]["partitioned_column"],
+                        }
+                    if alias:
+                        if alias not in used_tables_with_partition:
+                            used_tables_with_partition[alias] = {
+                                "full_table_name": full_table_name,
+                                "qualified": False,
+                                "alias": alias,
+                                "partition_column": columns_dict[k]["partitioned_column"],
+                            }
+                    break
+            elif full_table_name and full_table_name == k:
+                if full_table_name not in used_tables_with_partition:
+                    used_tables_with_partition[full_table_name] = {
+                        "full_table_name": full_table_name,
+                        "qualified": True,
+                        "alias": alias,
+                        "partition_column": columns_dict[k]["partitioned_column"],
+                    }
+                if alias:
+                    if alias not in used_tables_with_partition:
+                        used_tables_with_partition[alias] = {
+                            "full_table_name": full_table_name,
+                            "qualified": False,
+                            "alias": alias,
+                            "partition_column": columns_dict[k]["partitioned_column"],
+                        }
+    if table_index is not None:
+        table_index.statement_tables[key] = used_tables_with_partition
     return used_tables_with_partition
 
 
-def get_output_df(output: dict[str, Any], index_value: str) -> pd.DataFrame:
-    """Convert job output dictionary to pandas DataFrame.
+def get_output_df(records: list[dict[str, Any]]) -> pd.DataFrame:
+    """Convert job result records to pandas DataFrame.
 
     Args:
-        output: Dictionary of job results keyed by job ID
-        index_value: Column name for the index (typically 'job_id')
+        records: Job results, one dict per job with its job_id first
 
     Returns:
-        pd.DataFrame: DataFrame with job results and proper index
+        pd.DataFrame: DataFrame with job results in RESULTS_SCHEMA column order
     """
-
-    output_df = pd.DataFrame.from_dict(output, orient="index")
-    output_df = output_df.reset_index().rename(columns={"index": index_value})
-    return output_df
+    return pd.DataFrame.from_records(records, columns=RESULT_COLUMNS)
 
 
-def push_df_to_bq(df: pd.DataFrame, config: Config) -> None:
-    """Upload DataFrame to BigQuery table.
+def push_results_to_bq(records: list[dict[str, Any]], config: Config) -> None:
+    """Upload job results to BigQuery table.
 
-    Uploads the results DataFrame to a partitioned BigQuery table,
-    using date-based partitioning for efficient querying.
+    Loads the results as newline delimited JSON against RESULTS_SCHEMA into a
+    partitioned BigQuery table, using date-based partitioning for efficient
+    querying. No DataFrame or Parquet buffer is built for the upload.
 
     Args:
-        df: pandas DataFrame containing the results
+        records: Job results, one dict per job with its job_id first
         config: Configuration object containing BigQuery settings
     """
     table_id = "{dataset_project}.{dataset_name}.{table_name}".format(
@@ -383,18 +796,13 @@ def push_df_to_bq(df: pd.DataFrame, config: Config) -> None:
         dataset_name=config.bigquery_dataset,
         table_name=config.results_table_name,
     )
-    job_config = bigquery.LoadJobConfig(
-        write_disposition="WRITE_TRUNCATE",
-        time_partitioning=bigquery.TimePartitioning(
-            type_=bigquery.TimePartitioningType.DAY,
-            field="creation_date",  # field to use for partitioning
-        ),
-    )
-    job = get_client(config).load_table_from_dataframe(
-        df, table_id, job_config=job_config
+    rows = ({**record, "creation_date": str(record["creation_date"])} for record in records)
+    client = get_client(config)
+    job = client.load_table_from_json(
+        rows, table_id, job_config=RESULTS_LOAD_JOB_CONFIG
     )  # Make an API request.
 
     job.result()  # Wait
 
-    bq_table = get_client(config).get_table(table_id)  # Make an API request.
+    bq_table = client.get_table(table_id)  # Make an API request.
     print(f"Loaded {bq_table.num_rows} rows and {len(bq_table.schema)} columns to {table_id}")
@@ -19,6 +19,8 @@ Example:
 """
 
 import json
+import os
+import shutil
 import time
 from enum import Enum
 from pathlib import Path
@@ -30,7 +32,7 @@ from rich.table import Table
 
 from bq_sql_antipattern_checker import functions
 from bq_sql_antipattern_checker.antipatterns import Antipatterns
-from bq_sql_antipattern_checker.classes import Job
+from bq_sql_antipattern_checker.classes import Job, analyze_batch, prune_parse_cache
 from bq_sql_antipattern_checker.config import Config
 
 
@@ -46,6 +48,22 @@ class OutputFormat(str, Enum):
 app = typer.Typer(help="BigQuery SQL Antipattern Checker")
 console = Console()
 
+# Boolean result columns counted in the console summary
+ANTIPATTERN_COLUMNS = [
+    "select_star",
+    "partition_not_used",
+    "big_date_range",
+    "no_date_on_big_table",
+    "references_cte_multiple_times",
+    "semi_join_without_aggregation",
+    "order_without_limit",
+    "like_before_more_selective",
+    "regexp_in_where",
+    "queries_unpartitioned_table",
+    "distinct_on_big_table",
+    "count_distinct_on_big_table",
+]
+
 
 def save_results_locally(
     df: DataFrame, output_format: OutputFormat, output_file: Path | None, config: Config
@@ -90,29 +108,15 @@ def display_results_console(df: DataFrame) -> None:
     console.print(f"\n📊 Analysis Summary for {total_jobs} jobs:", style="bold blue")
 
     # Count antipatterns
-    antipattern_cols = [
-        "select_star",
-        "partition_not_used",
-        "big_date_range",
-        "no_date_on_big_table",
-        "references_cte_multiple_times",
-        "semi_join_without_aggregation",
-        "order_without_limit",
-        "like_before_more_selective",
-        "regexp_in_where",
-        "queries_unpartitioned_table",
-        "distinct_on_big_table",
-        "count_distinct_on_big_table",
-    ]
 
     summary_table = Table(title="Antipattern Detection Summary")
     summary_table.add_column("Antipattern", style="cyan")
     summary_table.add_column("Count", style="yellow")
     summary_table.add_column("Percentage", style="green")
 
-    for col in antipattern_cols:
+    for col in ANTIPATTERN_COLUMNS:
         if col in df.columns:
-            count = df[col].sum() if df[col].dtype == "bool" else len(df[df[col] == True])
+            count = df[col].sum() if df[col].dtype == "bool" else (df[col] == True).sum()
             percentage = f"{(count / total_jobs) * 100:.1f}%" if total_jobs > 0 else "0.0%"
             summary_table.add_row(col.replace("_", " ").title(), str(count), percentage)
 
@@ -124,17 +128,17 @@ def display_results_console(df: DataFrame) -> None:
 
         # Count total antipatterns per job
         df_copy = df.copy()
-        for col in antipattern_cols:
+        for col in ANTIPATTERN_COLUMNS:
             if col in df_copy.columns:
                 df_copy[col] = df_copy[col].astype(bool)
 
-        antipattern_count = df_copy[antipattern_cols].sum(axis=1)
+        antipattern_count = df_copy[ANTIPATTERN_COLUMNS].sum(axis=1)
         df_copy["total_antipatterns"] = antipattern_count
 
         # Show jobs with most antipatterns
         top_issues = df_copy.nlargest(5, "total_antipatterns")
 
-        if len(top_issues[top_issues["total_antipatterns"] > 0]) > 0:
+        if (top_issues["total_antipatterns"] > 0).any():
             issues_table = Table()
             issues_table.add_column("Job ID", style="cyan")
             issues_table.add_column("User", style="yellow")
@@ -188,6 +192,13 @@ def run_antipattern_check(
     output_file: Path | None = typer.Option(
         None, "--output-file", help="Output file path (optional, auto-generated if not specified)"
     ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Number of processes used to check jobs (default: CPU count, 1 runs serially)",
+    ),
 ) -> None:
     """Run the BigQuery SQL antipattern checker.
 
@@ -216,7 +227,16 @@ def run_antipattern_check(
             raise typer.Exit(code=1)
 
         # Run the antipattern check
-        run_check(config, verbose, dry_run, limit_row, cumul_perc, output_format, output_file)
+        run_check(
+            config,
+            verbose,
+            dry_run,
+            limit_row,
+            cumul_perc,
+            output_format,
+            output_file,
+            workers,
+        )
 
     except Exception as e:
         console.print(f"✗ Error: {e}", style="red")
@@ -384,8 +404,6 @@ def create_config(
 
         if package_config_path.exists():
             # Copy the default config
-            import shutil
-
             shutil.copy(package_config_path, output_file)
             console.print(f"✓ Created configuration file at {output_file}", style="green")
             return
@@ -484,6 +502,7 @@ def run_check(
     cumul_perc: float | None = None,
     output_format: OutputFormat = OutputFormat.CONSOLE,
     output_file: Path | None = None,
+    workers: int | None = None,
 ) -> None:
     """Run the antipattern check with the given configuration."""
     start = time.perf_counter()
@@ -491,46 +510,43 @@ def run_check(
         f"🔍 Checking Jobs Ran From: {config.date_values['query_run_date_str']}", style="blue"
     )
 
-    # Get columns dictionary
-    if verbose:
-        console.print("📊 Fetching column information...", style="blue")
-
-    columns_dict = functions.get_columns_dict(config)
-
-    # Get jobs dictionary
+    # Get jobs
     if verbose:
         console.print("📋 Fetching job information...", style="blue")
 
-    jobs_dict = functions.get_jobs_dict(config, limit_row, cumul_perc)
+    jobs_rows = list(functions.iter_jobs(config, limit_row, cumul_perc))
 
-    console.print(f"📈 Jobs Found: {len(jobs_dict)}", style="green")
+    console.print(f"📈 Jobs Found: {len(jobs_rows)}", style="green")
 
-    # Process jobs
-    job_output = {}
-    processed_jobs = 0
-    antipatterns = Antipatterns(config)
-    for k, v in jobs_dict.items():
-        job_id = v["job_id"]
-        job = Job(v, antipatterns)
-        job.check_antipatterns(columns_dict, config)
-
-        job_output[job_id] = job.__dict__
-        del job_output[job_id][
-            "antipatterns"
-        ]  # antipatterns object needs to be removed to convert dataframe
-        processed_jobs += 1
+    # Get columns dictionary, only for datasets the jobs can reference
+    if verbose:
+        console.print("📊 Fetching column information...", style="blue")
 
-        if verbose and processed_jobs % 100 == 0:
-            console.print(f"Processed {processed_jobs}/{len(jobs_dict)} jobs", style="blue")
+    datasets = functions.get_referenced_datasets(v["query"] for v in jobs_rows)
+    columns_dict = functions.get_columns_dict(config, datasets)
 
-    # Prepare output DataFrame
+    # Process jobs
     if verbose:
-        console.print("📊 Preparing output data...", style="blue")
+        console.print(
+            f"⚙️  Checking jobs with {workers or os.cpu_count()} worker(s)...", style="blue"
+        )
 
-    job_output_df = functions.get_output_df(job_output, "job_id")
+    antipatterns = Antipatterns(config)
+    jobs = [Job(v, antipatterns) for v in jobs_rows]
+    checked_jobs = analyze_batch(jobs, columns_dict, config, workers)
+    prune_parse_cache()
+    job_output = [
+        {"job_id": v["job_id"], **job.to_dict()}
+        for v, job in zip(jobs_rows, checked_jobs, strict=True)
+    ]
 
     # Handle output - either push to BigQuery or save locally
     if dry_run:
+        if verbose:
+            console.print("📊 Preparing output data...", style="blue")
+
+        job_output_df = functions.get_output_df(job_output)
+
         if verbose:
             console.print("💾 Saving results locally...", style="blue")
 
@@ -539,7 +555,7 @@ def run_check(
         if verbose:
             console.print("📤 Pushing results to BigQuery...", style="blue")
 
-        functions.push_df_to_bq(job_output_df, config)
+        functions.push_results_to_bq(job_output, config)
 
     end = time.perf_counter()
     elapsed = end - start
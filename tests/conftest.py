@@ -1,5 +1,6 @@
 """Test configuration and fixtures."""
 
+from datetime import date, datetime
 from pathlib import Path
 
 import pytest
@@ -60,3 +61,19 @@ def sample_sql_queries():
         "order_without_limit": "SELECT col1, col2 FROM `project.dataset.table` ORDER BY col1",
         "clean_query": "SELECT col1, col2 FROM `project.dataset.table` WHERE date = '2023-01-01'",
     }
+
+
+@pytest.fixture
+def job_row():
+    """Fixture that provides a job row as returned by the jobs query."""
+    return {
+        "creation_date": date(2024, 1, 2),
+        "creation_time": datetime(2024, 1, 2, 3, 4, 5),
+        "project_id": "project",
+        "user_email": "user@example.com",
+        "reservation_id": None,
+        "total_process_gb": 1.0,
+        "total_slot_hrs": 2.0,
+        "total_duration_mins": 3.0,
+        "query": "SELECT DISTINCT col1 FROM `project.dataset.large_table`",
+    }
@@ -1,11 +1,18 @@
 """Tests for antipattern detection functions."""
 
+import datetime as dt
 from unittest.mock import MagicMock, patch
 
 import pytest
-from sqlglot import parse_one
-
-from src.bq_sql_antipattern_checker.antipatterns import Antipatterns
+from sqlglot import exp, parse_one
+
+from src.bq_sql_antipattern_checker import functions
+from src.bq_sql_antipattern_checker.antipatterns import (
+    Antipatterns,
+    _scan_clause,
+    _select_table_names,
+    get_checker,
+)
 from src.bq_sql_antipattern_checker.config import Config
 
 
@@ -81,6 +88,16 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_select_star(ast)
         assert result is False
 
+    def test_check_select_star_count_anywhere_in_select(self, antipatterns_checker):
+        """Test that a COUNT found after the star still excludes the select."""
+        for sql, expected in (
+            ("SELECT *, (SELECT COUNT(1) FROM c) AS n FROM `project.dataset.table`", False),
+            ("WITH c AS (SELECT 1 AS a) SELECT * FROM c", False),
+            ("WITH c AS (SELECT a FROM c2) SELECT * FROM `project.dataset.table`", True),
+        ):
+            ast = parse_one(sql, dialect="bigquery")
+            assert antipatterns_checker.check_select_star(ast) is expected
+
     def test_check_order_without_limit_positive(self, antipatterns_checker):
         """Test detection of ORDER BY without LIMIT."""
         sql = "SELECT col1, col2 FROM `project.dataset.table` ORDER BY col1"
@@ -123,6 +140,22 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_regexp_in_where(ast)
         assert result is False
 
+    def test_check_regexp_in_where_with_and_without_index(self, antipatterns_checker):
+        """Test that the indexed and unindexed checks only look inside the WHERE clause."""
+        sql = (
+            "SELECT REGEXP_EXTRACT(col1, r'a') FROM `project.dataset.table` "
+            "WHERE col2 IN (SELECT col2 FROM t WHERE REGEXP_CONTAINS(col2, r'b'))"
+        )
+        ast = parse_one(sql, dialect="bigquery")
+        select_only = parse_one(
+            "SELECT REGEXP_EXTRACT(col1, r'a') FROM t WHERE col2 = 1", dialect="bigquery"
+        )
+
+        for statement, expected in ((ast, True), (select_only, False)):
+            index = functions.index_ast(statement)
+            assert antipatterns_checker.check_regexp_in_where(statement) is expected
+            assert antipatterns_checker.check_regexp_in_where(statement, index) is expected
+
     def test_check_semi_join_without_aggregation_positive(self, antipatterns_checker):
         """Test detection of semi-join without aggregation."""
         sql = """
@@ -156,6 +189,43 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_semi_join_without_aggregation(ast)
         assert result is False
 
+    def test_check_semi_join_without_aggregation_negative_no_in(self, antipatterns_checker):
+        """Test no false positive when "IN" only appears in other keywords."""
+        sql = """
+        SELECT col1
+        FROM `project.dataset.table1` t1
+        WHERE t1.id = (SELECT MIN(id) FROM `project.dataset.table2`)
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_semi_join_without_aggregation(ast)
+        assert result is False
+
+    def test_check_semi_join_without_aggregation_nested_where(self, antipatterns_checker):
+        """Test that an IN in a subquery's WHERE is found through the enclosing clauses."""
+        sql = """
+        SELECT col1
+        FROM `project.dataset.table1` t1
+        WHERE t1.id = 1 AND EXISTS (
+            SELECT DISTINCT id FROM `project.dataset.table2` t2
+            WHERE t2.id IN (SELECT id FROM `project.dataset.table3`)
+        )
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_semi_join_without_aggregation(ast)
+        assert result is True
+
+    def test_check_semi_join_without_aggregation_other_subquery(self, antipatterns_checker):
+        """Test that only the IN subqueries of a WHERE are checked for aggregation."""
+        sql = """
+        SELECT col1
+        FROM `project.dataset.table1` t1
+        WHERE t1.id IN (1, 2)
+        AND t1.value = (SELECT value FROM `project.dataset.table2` LIMIT 1)
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_semi_join_without_aggregation(ast)
+        assert result is False
+
     def test_check_multiple_cte_reference_positive(self, antipatterns_checker):
         """Test detection of multiple CTE references."""
         sql = """
@@ -182,6 +252,34 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_multiple_cte_reference(ast)
         assert result is False
 
+    def test_check_multiple_cte_reference_aliased(self, antipatterns_checker):
+        """Test detection when the CTE is referenced with an alias from other CTEs."""
+        sql = """
+        WITH data AS (
+            SELECT col1, col2 FROM `project.dataset.table`
+        ),
+        a AS (SELECT d.col1 FROM data d),
+        b AS (SELECT d.col2 FROM data AS d)
+        SELECT * FROM a JOIN b ON TRUE
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_multiple_cte_reference(ast)
+        assert result is True
+
+    def test_check_multiple_cte_reference_qualified_table(self, antipatterns_checker):
+        """Test that a dataset table sharing a CTE's name isn't counted as a reference."""
+        sql = """
+        WITH data AS (
+            SELECT col1, col2 FROM `project.dataset.table`
+        ),
+        a AS (SELECT d.col1 FROM data d),
+        b AS (SELECT d.col2 FROM `project.dataset.data` d)
+        SELECT * FROM a JOIN b ON TRUE
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_multiple_cte_reference(ast)
+        assert result is False
+
     def test_check_big_date_range_positive(self, antipatterns_checker):
         """Test detection of big date range antipattern."""
         sql = """
@@ -194,6 +292,67 @@ class TestAntipatternDetection:
         # Note: This might be False due to implementation complexity, but test structure is correct
         assert isinstance(result, bool)
 
+    def test_big_date_range_measured_from_given_time(self, antipatterns_checker):
+        """Test that literal date ranges are measured from the reference time passed in."""
+        ast = parse_one(
+            "SELECT a FROM t WHERE date_column BETWEEN '2024-01-01' AND '2024-02-01'",
+            dialect="bigquery",
+        )
+        between = ast.find(exp.Between)
+
+        for now, expected in ((dt.datetime(2024, 6, 1), False), (dt.datetime(2025, 6, 1), True)):
+            assert antipatterns_checker._is_big_date_range(between, "date_column", now=now) is (
+                expected
+            )
+
+    def test_check_big_date_range_stops_at_first_big_range(self, antipatterns_checker):
+        """Test that clauses after the first big range aren't scanned for the range check."""
+        sql = (
+            "SELECT a FROM t JOIN u ON u.ts >= '2020-01-01' "
+            "WHERE date_column BETWEEN '2020-01-01' AND '2020-02-01'"
+        )
+        ast = parse_one(sql, dialect="bigquery")
+
+        with patch(
+            "src.bq_sql_antipattern_checker.antipatterns._scan_clause", wraps=_scan_clause
+        ) as mock_scan:
+            assert antipatterns_checker.check_big_date_range(ast) is True
+
+        assert mock_scan.call_count == 1
+
+    def test_big_date_range_ignores_non_date_literals(self, antipatterns_checker):
+        """Test that only literals starting with a YYYY-MM-DD date are sized."""
+        now = dt.datetime(2025, 6, 1)
+        for literal, expected in (
+            ("2024-01-01T00:00:00", True),
+            ("2025-05-01 10:00", False),
+            ("not-a-date-at-all", False),
+            ("2024-13-45", False),
+        ):
+            ast = parse_one(f"SELECT a FROM t WHERE date_column >= '{literal}'", dialect="bigquery")
+
+            assert (
+                antipatterns_checker._is_big_date_range(ast.find(exp.GTE), "date_column", now=now)
+                is expected
+            )
+
+    def test_big_date_range_interval_parts(self, antipatterns_checker):
+        """Test that ISO date parts are sized and parts with no day count are skipped."""
+        for condition, expected in (
+            ("date_column >= DATE_SUB(CURRENT_DATE(), INTERVAL 2 ISOYEAR)", True),
+            ("date_column >= DATE_SUB(CURRENT_DATE(), INTERVAL 500 MILLISECOND)", False),
+            ("date_column >= DATE_SUB(CURRENT_DATE(), INTERVAL 500 MICROSECOND)", False),
+            ("date_column >= CURRENT_DATE() - INTERVAL 500 DAYOFWEEK", False),
+            (
+                "date_column BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 500 MILLISECOND)"
+                " AND CURRENT_DATE()",
+                False,
+            ),
+        ):
+            ast = parse_one(f"SELECT a FROM t WHERE {condition}", dialect="bigquery")
+
+            assert antipatterns_checker.check_big_date_range(ast) is expected
+
     @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
     def test_check_distinct_on_big_table_positive(
         self, mock_get_queried_tables, antipatterns_checker, mock_queried_tables
@@ -205,6 +364,29 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_distinct_on_big_table(ast, {})
         assert isinstance(result, bool)
 
+    def test_distinct_checks_read_the_index(self, antipatterns_checker, mock_queried_tables):
+        """Test that the DISTINCT lookups use the node index instead of walking the select."""
+        for sql, expected in (
+            ("SELECT DISTINCT col1 FROM `project.dataset.large_table`", (True, False)),
+            ("SELECT COUNT(DISTINCT col1) FROM `project.dataset.large_table`", (True, True)),
+            ("SELECT (SELECT COUNT(a) FROM t), DISTINCT_LIKE(b) FROM t", (False, False)),
+        ):
+            ast = parse_one(sql, dialect="bigquery")
+            index = functions.index_ast(ast)
+
+            with patch.object(exp.Expression, "find") as mock_find:
+                result = (
+                    antipatterns_checker.check_distinct_on_big_table(
+                        ast, {}, index, mock_queried_tables
+                    ),
+                    antipatterns_checker.check_count_distinct_on_big_table(
+                        ast, {}, index, mock_queried_tables
+                    ),
+                )
+
+            mock_find.assert_not_called()
+            assert result == expected
+
     @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
     def test_check_count_distinct_on_big_table_positive(
         self, mock_get_queried_tables, antipatterns_checker, mock_queried_tables
@@ -216,6 +398,33 @@ class TestAntipatternDetection:
         result = antipatterns_checker.check_count_distinct_on_big_table(ast, {})
         assert isinstance(result, bool)
 
+    @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
+    def test_check_count_distinct_on_big_table_without_count(
+        self, mock_get_queried_tables, antipatterns_checker, mock_queried_tables
+    ):
+        """Test that a statement without COUNT is reported as not flagged, not as an error."""
+        mock_get_queried_tables.return_value = mock_queried_tables
+        sql = "SELECT DISTINCT col1 FROM `project.dataset.large_table`"
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_count_distinct_on_big_table(ast, {})
+        assert result is False
+
+    @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
+    def test_distinct_checks_use_configured_threshold(
+        self, mock_get_queried_tables, antipatterns_checker, mock_queried_tables
+    ):
+        """Test that the distinct checks look tables up with the instance's threshold."""
+        mock_get_queried_tables.return_value = mock_queried_tables
+        antipatterns_checker.config.distinct_function_row_count = 123
+        sql = "SELECT COUNT(DISTINCT col1) FROM `project.dataset.large_table`"
+        ast = parse_one(sql, dialect="bigquery")
+
+        assert antipatterns_checker.check_distinct_on_big_table(ast, {}) is True
+        assert antipatterns_checker.check_count_distinct_on_big_table(ast, {}) is True
+        assert mock_get_queried_tables.call_count == 2
+        for call in mock_get_queried_tables.call_args_list:
+            assert call.args[2] == 123
+
     def test_check_partition_used(self, antipatterns_checker, mock_columns_dict):
         """Test partition usage detection."""
         sql = "SELECT col1 FROM `project.dataset.large_table` WHERE date_column = '2024-01-01'"
@@ -226,6 +435,74 @@ class TestAntipatternDetection:
         assert isinstance(partition_not_used, bool)
         assert isinstance(available_partitions, list)
 
+    def test_check_partition_used_in_nested_where(self, antipatterns_checker):
+        """Test that a partition filter in a subquery's WHERE counts and is walked once."""
+        partitioned_tables = {
+            "project.dataset.large_table": {
+                "partition_column": "date_column",
+                "full_table_name": "project.dataset.large_table",
+            }
+        }
+        sql = """
+        SELECT a FROM `project.dataset.large_table`
+        WHERE id IN (SELECT id FROM `project.dataset.large_table` WHERE date_column = '2024-01-01')
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        with patch(
+            "bq_sql_antipattern_checker.antipatterns.functions.get_column_and_table_name_from_column",
+            wraps=functions.get_column_and_table_name_from_column,
+        ) as mock_column_names:
+            result = antipatterns_checker.check_partition_used(
+                ast, {}, partitioned_tables=partitioned_tables
+            )
+
+        assert result == (False, [])
+        assert mock_column_names.call_count == 3
+
+    def test_check_partition_used_shared_partition_column(self, antipatterns_checker):
+        """Test how a partition column shared by several tables is matched to them."""
+        partitioned_tables = {
+            name: {"partition_column": "DS", "full_table_name": name}
+            for name in ("project.dataset.a", "project.dataset.b")
+        }
+        results = {}
+        for column in ("ds", "x.ds"):
+            sql = (
+                "SELECT 1 FROM `project.dataset.a` JOIN `project.dataset.b` USING (id) "
+                f"WHERE {column} = '2024-01-01'"
+            )
+            ast = parse_one(sql, dialect="bigquery")
+            results[column] = antipatterns_checker.check_partition_used(
+                ast, {}, partitioned_tables=partitioned_tables
+            )
+
+        # An unqualified column is credited to the first table, an unknown qualifier to all
+        assert results["ds"] == (
+            True,
+            [{"table_name": "project.dataset.b", "partitioned_column": "DS"}],
+        )
+        assert results["x.ds"] == (False, [])
+
+    def test_check_partition_used_stops_when_all_matched(self, antipatterns_checker):
+        """Test that columns after every partitioned table is matched aren't resolved."""
+        partitioned_tables = {
+            "project.dataset.a": {"partition_column": "ds", "full_table_name": "project.dataset.a"}
+        }
+        sql = "SELECT 1 FROM `project.dataset.a` WHERE ds = '2024-01-01' AND (x = 1 OR y = 2)"
+        ast = parse_one(sql, dialect="bigquery")
+
+        with patch(
+            "bq_sql_antipattern_checker.antipatterns.functions.get_column_and_table_name_from_column",
+            wraps=functions.get_column_and_table_name_from_column,
+        ) as mock_column_names:
+            result = antipatterns_checker.check_partition_used(
+                ast, {}, partitioned_tables=partitioned_tables
+            )
+
+        assert result == (False, [])
+        assert mock_column_names.call_count == 1
+
     @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
     def test_check_unpartitioned_tables(
         self, mock_get_queried_tables, antipatterns_checker, mock_columns_dict, mock_queried_tables
@@ -254,6 +531,175 @@ class TestAntipatternDetection:
         assert isinstance(no_date_on_big_table, bool)
         assert isinstance(tables_without_date_filter, list)
 
+    @patch("bq_sql_antipattern_checker.antipatterns.functions.get_queried_tables")
+    def test_check_date_filters_matches_separate_checks(
+        self, mock_get_queried_tables, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that the shared date filter walk gives the same results as each check."""
+        mock_get_queried_tables.return_value = mock_queried_tables
+        sql = """
+        SELECT col1
+        FROM `project.dataset.large_table`
+        WHERE date_column >= DATE_SUB(CURRENT_DATE(), INTERVAL 400 DAY)
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        big_date_range, no_date_on_big_table, tables_without_date_filter = (
+            antipatterns_checker.check_date_filters(ast, mock_columns_dict)
+        )
+        assert big_date_range is True
+        assert big_date_range == antipatterns_checker.check_big_date_range(ast)
+        assert (no_date_on_big_table, tables_without_date_filter) == (
+            antipatterns_checker.check_big_table_no_date(ast, mock_columns_dict)
+        )
+
+    def test_check_date_filters_ignores_unnest_clauses(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that a date filter in a clause over an unnested array doesn't count."""
+        sql = """
+        SELECT col1
+        FROM `project.dataset.large_table`
+        WHERE EXISTS (SELECT 1 FROM UNNEST(items) i WHERE date_column >= '2024-01-01')
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        filtered_ast = parse_one(
+            "SELECT col1 FROM `project.dataset.large_table` WHERE date_column >= '2024-01-01'",
+            dialect="bigquery",
+        )
+
+        assert antipatterns_checker.check_date_filters(
+            ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+        ) == (False, True, ["project.dataset.large_table"])
+        assert antipatterns_checker.check_date_filters(
+            filtered_ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+        ) == (False, False, [])
+
+    def test_check_date_filters_unqualified_column(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that an unqualified date column is matched against the select's tables."""
+        mock_queried_tables["l"] = {**mock_queried_tables["project.dataset.large_table"]}
+        mock_queried_tables["l"]["is_alias"] = True
+        results = {}
+        for column in ("date_column", "update_time"):
+            sql = f"""
+            SELECT col1 FROM `project.dataset.large_table` l WHERE {column} >= '2024-01-01'
+            """
+            ast = parse_one(sql, dialect="bigquery")
+            results[column] = antipatterns_checker.check_date_filters(
+                ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+            )
+
+        assert results["date_column"] == (False, False, [])
+        assert results["update_time"] == (False, True, ["project.dataset.large_table"])
+
+    def test_check_date_filters_select_tables_resolved_once(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that a select's tables are named once for all its unqualified date filters."""
+        sql = """
+        SELECT col1 FROM `project.dataset.large_table` l
+        WHERE date_column >= '2024-01-01' AND timestamp_column >= '2024-01-01'
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        with patch(
+            "src.bq_sql_antipattern_checker.antipatterns._select_table_names",
+            wraps=_select_table_names,
+        ) as mock_names:
+            result = antipatterns_checker.check_date_filters(
+                ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+            )
+
+        assert result == (False, False, [])
+        mock_names.assert_called_once_with(ast)
+
+    def test_check_date_filters_compared_to_cte_column(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that a date column compared to a CTE's column filters the queried table."""
+        mock_queried_tables["l"] = {**mock_queried_tables["project.dataset.large_table"]}
+        mock_queried_tables["l"]["is_alias"] = True
+        sql = """
+        WITH dates AS (SELECT MAX(created_at) AS max_date FROM `project.dataset.small_table`)
+        SELECT col1 FROM `project.dataset.large_table` l CROSS JOIN dates
+        WHERE dates.max_date >= l.date_column
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        assert antipatterns_checker.check_date_filters(
+            ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+        ) == (False, False, [])
+
+    def test_check_date_filters_without_compared_column(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that a date comparison on a named field that isn't a column is skipped."""
+        sql = """
+        SELECT col1 FROM `project.dataset.large_table`
+        WHERE STRUCT(CURRENT_DATE() AS date_a).date_a >= '2024-01-01'
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        assert antipatterns_checker.check_date_filters(
+            ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+        ) == (False, True, ["project.dataset.large_table"])
+
+    def test_check_date_filters_update_compared_to_subquery(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test a date comparison outside any select, in an UPDATE condition."""
+        sql = """
+        UPDATE `project.dataset.large_table` SET col1 = 1
+        WHERE date_column > (SELECT MAX(created_at) FROM `project.dataset.small_table`)
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        assert antipatterns_checker.check_date_filters(
+            ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+        ) == (False, False, [])
+
+    def test_check_date_filters_nested_comparison_recorded_once(
+        self, antipatterns_checker, mock_columns_dict, mock_queried_tables
+    ):
+        """Test that a comparison inside nested clauses has its columns resolved once."""
+        sql = """
+        SELECT col1 FROM `project.dataset.large_table`
+        WHERE id IN (
+            SELECT id FROM `project.dataset.large_table` WHERE date_column >= '2024-01-01'
+        )
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        with patch(
+            "bq_sql_antipattern_checker.antipatterns.functions.get_column_and_table_name_from_column",
+            wraps=functions.get_column_and_table_name_from_column,
+        ) as mock_column_names:
+            result = antipatterns_checker.check_date_filters(
+                ast, mock_columns_dict, queried_tables=mock_queried_tables, check_range=False
+            )
+
+        assert result == (False, False, [])
+        assert mock_column_names.call_count == 1
+
+    def test_scan_clause_stops_at_nested_clauses(self):
+        """Test that a clause keeps its own comparisons and picks up nested unnests."""
+        sql = """
+        SELECT col1 FROM `project.dataset.large_table`
+        WHERE ts >= '2024-01-01'
+        AND EXISTS (SELECT 1 FROM UNNEST(items) i WHERE date_column >= '2024-01-01')
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        outer, inner = ast.find_all(exp.Where)
+        scanned = {}
+
+        comparisons, has_unnest = _scan_clause(outer, scanned)
+
+        assert [c.this.name for c in comparisons] == ["ts"]
+        assert has_unnest
+        assert [c.this.name for c in scanned[id(inner)][0]] == ["date_column"]
+        assert _scan_clause(inner, scanned) is scanned[id(inner)]
+
 
 class TestAntipatternConfiguration:
     """Test antipattern configuration and class functionality."""
@@ -264,6 +710,16 @@ class TestAntipatternConfiguration:
         antipatterns_checker = Antipatterns(config)
         assert antipatterns_checker.config == config
 
+    def test_checker_shared_per_config(self):
+        """Test that one checker is kept per Config object, including the default one."""
+        config = Config.from_env()
+        other = Config.from_env()
+
+        assert get_checker(config) is get_checker(config)
+        assert get_checker(config).config is config
+        assert get_checker(other) is not get_checker(config)
+        assert get_checker() is get_checker()
+
     def test_config_antipattern_enabled_check(self):
         """Test that config properly controls which antipatterns are enabled."""
         config = Config.from_env()
@@ -343,7 +799,7 @@ class TestLikeBeforeMoreSelective:
         """
         ast = parse_one(sql, dialect="bigquery")
         result = antipatterns_checker.check_like_before_more_selective(ast)
-        assert isinstance(result, bool)
+        assert result is True
 
     def test_check_like_before_more_selective_negative(self, antipatterns_checker):
         """Test no false positive when more selective condition comes first."""
@@ -354,4 +810,61 @@ class TestLikeBeforeMoreSelective:
         """
         ast = parse_one(sql, dialect="bigquery")
         result = antipatterns_checker.check_like_before_more_selective(ast)
-        assert isinstance(result, bool)
+        assert result is False
+
+    def test_check_like_before_more_selective_ignores_placeholder(self, antipatterns_checker):
+        """Test that a leading 1=1 placeholder isn't treated as a selective condition."""
+        sql = """
+        SELECT col1
+        FROM `project.dataset.table`
+        WHERE 1=1 AND col1 LIKE '%test%' AND date_column = '2024-01-01'
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_like_before_more_selective(ast)
+        assert result is True
+
+    def test_check_like_before_more_selective_only_like(self, antipatterns_checker):
+        """Test no detection when there's no more selective condition to reorder."""
+        sql = "SELECT col1 FROM `project.dataset.table` WHERE GTE_flag LIKE '%test%'"
+        ast = parse_one(sql, dialect="bigquery")
+        result = antipatterns_checker.check_like_before_more_selective(ast)
+        assert result is False
+
+    def test_check_like_before_more_selective_with_index(self, antipatterns_checker):
+        """Test that the node index gives the same results and skips WHEREs without LIKE."""
+        for sql, expected in (
+            ("SELECT a FROM t WHERE a LIKE '%x%' AND b = 1", True),
+            ("SELECT a FROM t WHERE b = 1 AND a LIKE '%x%'", False),
+            ("SELECT a LIKE '%x%' FROM t WHERE b = 1", False),
+        ):
+            ast = parse_one(sql, dialect="bigquery")
+            index = functions.index_ast(ast)
+            assert antipatterns_checker.check_like_before_more_selective(ast, index) is expected
+
+        where = ast.args["where"]
+        with patch.object(type(where), "walk") as mock_walk:
+            antipatterns_checker.check_like_before_more_selective(ast, index)
+        mock_walk.assert_not_called()
+
+    def test_check_like_before_more_selective_reuses_regexp_result(self, antipatterns_checker):
+        """Test that a known REGEXP result decides whether REGEXP functions are looked for."""
+        ast = parse_one(
+            "SELECT a FROM t WHERE REGEXP_CONTAINS(a, r'x') AND b = 1", dialect="bigquery"
+        )
+        index = functions.index_ast(ast)
+
+        with patch(
+            "bq_sql_antipattern_checker.antipatterns.functions.is_descendant",
+            wraps=functions.is_descendant,
+        ) as mock_is_descendant:
+            assert antipatterns_checker.check_like_before_more_selective(
+                ast, index, has_regexp=True
+            )
+            mock_is_descendant.assert_not_called()
+            assert antipatterns_checker.check_like_before_more_selective(ast, index) is True
+            mock_is_descendant.assert_called()
+        # Without REGEXP functions only a LIKE can come first
+        assert (
+            antipatterns_checker.check_like_before_more_selective(ast, index, has_regexp=False)
+            is False
+        )
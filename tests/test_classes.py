@@ -0,0 +1,393 @@
+"""Tests for the Job class."""
+
+import importlib
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlglot import exp
+
+from src.bq_sql_antipattern_checker import functions
+from src.bq_sql_antipattern_checker.antipatterns import Antipatterns
+from src.bq_sql_antipattern_checker.classes import (
+    JOB_OUTPUT_FIELDS,
+    PARSE_CACHE_DIR_ENV,
+    Job,
+    StatementCache,
+    _chunksize,
+    _parse_cached,
+    analyze_batch,
+    prune_parse_cache,
+)
+from src.bq_sql_antipattern_checker.config import Config
+from src.bq_sql_antipattern_checker.functions import RESULT_COLUMNS
+
+
+@pytest.fixture
+def mock_columns_dict():
+    """Fixture that provides mock column dictionary for testing."""
+    return {
+        "project.dataset.large_table": {
+            "total_rows": 100000,
+            "partitioned_column": "date_column",
+            "datetime_columns": ["date_column"],
+            "table": "large_table",
+        },
+    }
+
+
+class TestJobCheckAntipatterns:
+    """Test antipattern orchestration on a Job."""
+
+    def test_queried_tables_resolved_once_per_threshold(self, job_row, mock_columns_dict):
+        """Test that table metadata is looked up once per statement, not once per check."""
+        config = Config.from_env()
+        job = Job(job_row, Antipatterns(config))
+
+        with patch(
+            "bq_sql_antipattern_checker.classes.functions.get_queried_tables",
+            return_value={},
+        ) as mock_get_queried_tables:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        thresholds = {call.args[2] for call in mock_get_queried_tables.call_args_list}
+        assert mock_get_queried_tables.call_count >= 1
+        assert mock_get_queried_tables.call_count == len(thresholds)
+
+    def test_table_refs_skipped_without_table_checks(self, job_row, mock_columns_dict):
+        """Test that no table metadata is resolved when only AST checks are enabled."""
+        config = Config.from_env()
+        for name in (
+            "partition_not_used",
+            "big_table_no_date",
+            "unpartitioned_tables",
+            "distinct_on_big_table",
+            "count_distinct_on_big_table",
+        ):
+            config.antipatterns[name].enabled = False
+        job = Job(job_row, Antipatterns(config))
+
+        with patch(
+            "bq_sql_antipattern_checker.classes.functions.get_table_refs"
+        ) as mock_get_table_refs:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        mock_get_table_refs.assert_not_called()
+
+    def test_statement_parsed_once_across_jobs(self, job_row, mock_columns_dict):
+        """Test that repeated statement text reuses the cached AST."""
+        config = Config.from_env()
+        _parse_cached.cache_clear()
+
+        for _ in range(3):
+            Job(job_row, Antipatterns(config)).check_antipatterns(mock_columns_dict, config)
+
+        cache_info = _parse_cached.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 2
+
+    def test_flagged_checks_skipped_for_later_statements(self, job_row, mock_columns_dict):
+        """Test that a boolean check isn't run again once a statement has flagged it."""
+        config = Config.from_env()
+        job_row["query"] = "SELECT * FROM `project.dataset.t`; SELECT * FROM `project.dataset.t`;"
+        job = Job(job_row, Antipatterns(config))
+
+        with patch.object(
+            Antipatterns, "check_select_star", return_value=True
+        ) as mock_check_select_star:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        assert job.select_star is True
+        assert mock_check_select_star.call_count == 1
+
+    def test_pending_checks_decided_once_per_job(self, job_row, mock_columns_dict):
+        """Test that the checks to run aren't recomputed from the job flags per statement."""
+        config = Config.from_env()
+        job_row["query"] = "SELECT * FROM `project.dataset.t`; SELECT 1; SELECT 2;"
+        job = Job(job_row, Antipatterns(config))
+
+        with patch.object(Job, "get_pending_checks", wraps=job.get_pending_checks) as mock_pending:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        mock_pending.assert_called_once_with(config)
+        assert job.select_star is True
+
+    def test_enabled_checks_resolved_once(self, job_row, mock_columns_dict):
+        """Test that enabled flags come from the Antipatterns object, not a lookup per statement."""
+        config = Config.from_env()
+        config.antipatterns["select_star"].enabled = False
+        job_row["query"] = "SELECT * FROM `project.dataset.t`; SELECT * FROM `project.dataset.t`;"
+        job = Job(job_row, Antipatterns(config))
+
+        with patch.object(config, "is_antipattern_enabled") as mock_is_enabled:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        mock_is_enabled.assert_not_called()
+        assert job.select_star is False
+        assert "select_star" not in job.antipatterns.enabled
+
+    def test_statement_results_shared_across_jobs(self, job_row, mock_columns_dict):
+        """Test that jobs sharing a statement cache check each statement once."""
+        config = Config.from_env()
+        antipatterns = Antipatterns(config)
+        uncached = Job(job_row, antipatterns)
+        uncached.check_antipatterns(mock_columns_dict, config)
+        statement_cache: dict = {}
+
+        with patch.object(
+            Antipatterns, "check_select_star", wraps=antipatterns.check_select_star
+        ) as mock_check_select_star:
+            jobs = [Job(job_row, antipatterns) for _ in range(3)]
+            for job in jobs:
+                job.check_antipatterns(mock_columns_dict, config, None, statement_cache)
+
+        assert mock_check_select_star.call_count == 1
+        assert len(statement_cache) == 1
+        for job in jobs:
+            assert job.distinct_on_big_table is uncached.distinct_on_big_table is True
+            assert job.tables_without_date_filter == uncached.tables_without_date_filter
+
+    def test_repeated_statement_checked_once(self, job_row, mock_columns_dict):
+        """Test that a statement repeated within a job is checked once without a cache."""
+        config = Config.from_env()
+        # Nothing is flagged, so both statements are checked for the same antipatterns
+        statement = "SELECT col1 FROM t ORDER BY col1 LIMIT 10"
+        job = Job({**job_row, "query": f"{statement};\n{statement};"}, Antipatterns(config))
+
+        with patch.object(
+            Job, "check_statement", autospec=True, side_effect=Job.check_statement
+        ) as mock_check_statement:
+            job.check_antipatterns(mock_columns_dict, config)
+
+        assert mock_check_statement.call_count == 1
+        assert job.order_without_limit is False
+
+    def test_default_config_built_once(self, job_row, mock_columns_dict, monkeypatch):
+        """Test that jobs checked without a config share one default config."""
+        antipatterns = Antipatterns(Config.from_env())
+        runtime_config = importlib.import_module("bq_sql_antipattern_checker.config")
+        monkeypatch.setattr(runtime_config, "_default_config", None)
+
+        with patch.object(
+            runtime_config.Config, "from_env", wraps=runtime_config.Config.from_env
+        ) as mock_from_env:
+            for _ in range(3):
+                Job(job_row, antipatterns).check_antipatterns(mock_columns_dict)
+
+        mock_from_env.assert_called_once_with()
+
+    def test_default_checker_enabled_checks_reused(self, job_row, mock_columns_dict):
+        """Test that jobs checked with the default config reuse the default checker's checks."""
+        runtime_antipatterns = importlib.import_module("bq_sql_antipattern_checker.antipatterns")
+        antipatterns = Antipatterns(Config.from_env())
+        Job(job_row, antipatterns).check_antipatterns(mock_columns_dict)
+
+        with patch.object(
+            runtime_antipatterns.Antipatterns,
+            "enabled_antipatterns",
+            wraps=runtime_antipatterns.Antipatterns.enabled_antipatterns,
+        ) as mock_enabled:
+            for _ in range(3):
+                Job(job_row, antipatterns).check_antipatterns(mock_columns_dict)
+
+        mock_enabled.assert_not_called()
+        assert runtime_antipatterns.get_checker() is runtime_antipatterns.get_checker()
+
+    def test_table_results_collected_across_statements(self, job_row, mock_columns_dict):
+        """Test that tables from every statement are kept once, without placeholders."""
+        config = Config.from_env()
+        job_row["query"] = "SELECT 1; SELECT 2; SELECT 3;"
+        job = Job(job_row, Antipatterns(config))
+        results = iter(
+            [
+                (True, ["project.dataset.b"]),
+                (False, []),
+                (True, ["project.dataset.a", "project.dataset.b"]),
+            ]
+        )
+
+        with patch.object(
+            Antipatterns, "check_unpartitioned_tables", side_effect=lambda *_: next(results)
+        ):
+            job.check_antipatterns(mock_columns_dict, config)
+
+        assert job.queries_unpartitioned_table is True
+        assert job.unpartitioned_tables == ["project.dataset.a", "project.dataset.b"]
+
+    def test_shard_totals_summed_once_per_run(self, job_row):
+        """Test that a wildcard's shard rows are summed once for all jobs referencing it."""
+        config = Config.from_env()
+        columns_dict = {
+            f"project.dataset.events_2024010{day}": {
+                "total_rows": 100000,
+                "partitioned_column": None,
+                "datetime_columns": ["ts"],
+                "table": f"events_2024010{day}",
+            }
+            for day in range(1, 4)
+        }
+        table_index = functions.TableIndex(columns_dict)
+        job_row["query"] = (
+            "SELECT * FROM `project.dataset.events_*`; SELECT 1 FROM `project.dataset.events_*`"
+        )
+
+        with patch.object(
+            functions, "summarize_tables", wraps=functions.summarize_tables
+        ) as mock_summarize:
+            for _ in range(3):
+                job = Job(job_row, Antipatterns(config))
+                job.check_antipatterns(columns_dict, config, table_index)
+
+        assert mock_summarize.call_count == 1
+        assert job.unpartitioned_tables == ["project.dataset.events_*"]
+
+    def test_to_dict(self, job_row):
+        """Test that to_dict returns output columns without the Antipatterns object."""
+        job = Job(job_row, Antipatterns(Config.from_env()))
+        job_dict = job.to_dict()
+
+        assert "antipatterns" not in job_dict
+        assert not hasattr(job.antipatterns, "__dict__")
+        assert job_dict["query"] == job_row["query"]
+        assert job_dict["creation_time"] == "2024-01-02 03:04:05"
+        assert list(job_dict)[-1] == "antipattern_run_time"
+        assert not hasattr(job, "__dict__")
+
+    def test_output_fields_match_results_schema(self):
+        """Test that the uploaded schema has a column for every output field."""
+        assert ["job_id", *JOB_OUTPUT_FIELDS] == RESULT_COLUMNS
+
+
+class TestAnalyzeBatch:
+    """Test the multi-job batch driver."""
+
+    def test_analyze_batch_matches_serial(self, job_row, mock_columns_dict):
+        """Test that jobs checked in worker processes get the same results as serially."""
+        config = Config.from_env()
+        serial = analyze_batch(
+            [Job(job_row, Antipatterns(config)) for _ in range(3)],
+            mock_columns_dict,
+            config,
+            workers=1,
+        )
+        parallel = analyze_batch(
+            [Job(job_row, Antipatterns(config)) for _ in range(3)],
+            mock_columns_dict,
+            config,
+            workers=2,
+        )
+
+        assert len(parallel) == 3
+        for s, p in zip(serial, parallel, strict=True):
+            assert p.distinct_on_big_table == s.distinct_on_big_table
+            assert p.no_date_on_big_table == s.no_date_on_big_table
+            assert p.tables_without_date_filter == s.tables_without_date_filter
+        assert parallel[0].distinct_on_big_table is True
+
+    def test_analyze_batch_uses_threads_without_gil(self, job_row, mock_columns_dict):
+        """Test that a free-threaded interpreter checks jobs in threads, not processes."""
+        config = Config.from_env()
+        jobs = [Job(job_row, Antipatterns(config)) for _ in range(3)]
+
+        with (
+            patch("src.bq_sql_antipattern_checker.classes._gil_disabled", return_value=True),
+            patch("src.bq_sql_antipattern_checker.classes.ProcessPoolExecutor") as mock_pool,
+        ):
+            checked = analyze_batch(jobs, mock_columns_dict, config, workers=2)
+
+        mock_pool.assert_not_called()
+        assert checked == jobs
+        assert all(job.distinct_on_big_table is True for job in checked)
+
+    def test_analyze_batch_chunksize(self):
+        """Test that known batch sizes are split into about 8 chunks per worker."""
+        assert _chunksize([None] * 1600, 4) == 50
+        assert _chunksize([None] * 3, 4) == 1
+        assert _chunksize(iter([None] * 1600), 4) == 16
+
+
+class TestStatementCache:
+    """Test the bounded cache of checked statements."""
+
+    def test_least_recently_used_statement_dropped(self):
+        """Test that reading a statement keeps it over statements stored after it."""
+        cache = StatementCache(maxsize=2)
+        cache[("a", frozenset())] = {"a": 1}
+        cache[("b", frozenset())] = {"b": 1}
+        assert cache[("a", frozenset())] == {"a": 1}
+
+        cache[("c", frozenset())] = {"c": 1}
+
+        assert list(cache) == [("a", frozenset()), ("c", frozenset())]
+
+
+class TestParseCache:
+    """Test the optional on-disk parse cache."""
+
+    def test_parsed_statement_reused_from_disk(self, tmp_path, monkeypatch):
+        """Test that a statement parsed on an earlier run is loaded instead of parsed."""
+        monkeypatch.setenv(PARSE_CACHE_DIR_ENV, str(tmp_path))
+        sql = "SELECT a FROM `project.dataset.t` WHERE b = 1"
+        _parse_cached.cache_clear()
+        ast, _ = _parse_cached(sql)
+        _parse_cached.cache_clear()
+
+        with patch("src.bq_sql_antipattern_checker.classes.parse_one") as mock_parse_one:
+            cached_ast, cached_index = _parse_cached(sql)
+
+        mock_parse_one.assert_not_called()
+        assert cached_ast == ast
+        assert cached_index[exp.Column][0].parent_select is not None
+        _parse_cached.cache_clear()
+
+    def test_tampered_cache_entry_is_parsed_again(self, tmp_path, monkeypatch):
+        """Test that a cache entry naming a non-sqlglot class is rejected, not imported."""
+        monkeypatch.setenv(PARSE_CACHE_DIR_ENV, str(tmp_path))
+        sql = "SELECT a FROM `project.dataset.t`"
+        _parse_cached.cache_clear()
+        _parse_cached(sql)
+        _parse_cached.cache_clear()
+        (cache_path,) = tmp_path.iterdir()
+        cache_path.write_text(
+            json.dumps({"class": "subprocess.Popen", "args": {"args": "exit 1"}}),
+            encoding="utf-8",
+        )
+
+        with patch("subprocess.Popen") as mock_popen:
+            ast, _ = _parse_cached(sql)
+
+        mock_popen.assert_not_called()
+        assert ast.sql(dialect="bigquery") == sql
+        _parse_cached.cache_clear()
+
+    def test_prune_parse_cache(self, tmp_path, monkeypatch):
+        """Test that the least recently used entries are dropped to fit the size budget."""
+        monkeypatch.setenv(PARSE_CACHE_DIR_ENV, str(tmp_path))
+        for i in range(3):
+            path = tmp_path / f"{i}.json"
+            path.write_bytes(b"x" * 10)
+            os.utime(path, (i, i))
+
+        prune_parse_cache(max_bytes=20)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["1.json", "2.json"]
+
+    def test_prune_parse_cache_keeps_recent_hits(self, tmp_path, monkeypatch):
+        """Test that reading an old entry keeps it over newer entries that were not reused."""
+        monkeypatch.setenv(PARSE_CACHE_DIR_ENV, str(tmp_path))
+        _parse_cached.cache_clear()
+        sqls = [f"SELECT a FROM `project.dataset.t{i}`" for i in range(3)]
+        for i, sql in enumerate(sqls):
+            _parse_cached(sql)
+            (path,) = (p for p in tmp_path.iterdir() if p.stat().st_mtime > 100)
+            os.utime(path, (i, i))
+        _parse_cached.cache_clear()
+        (oldest,) = (p for p in tmp_path.iterdir() if p.stat().st_mtime == 0)
+        _parse_cached(sqls[0])
+        entry_size = oldest.stat().st_size
+
+        prune_parse_cache(max_bytes=entry_size + 1)
+
+        assert list(tmp_path.iterdir()) == [oldest]
+        _parse_cached.cache_clear()
@@ -0,0 +1,349 @@
+"""Tests for helper functions."""
+
+import json
+from typing import ClassVar
+from unittest.mock import patch
+
+from sqlglot import exp, parse_one
+
+from src.bq_sql_antipattern_checker import functions
+from src.bq_sql_antipattern_checker.antipatterns import Antipatterns
+from src.bq_sql_antipattern_checker.classes import Job
+from src.bq_sql_antipattern_checker.config import Config
+
+
+class TestIndexAst:
+    """Test the single-pass AST node index."""
+
+    def test_index_matches_find_all(self):
+        """Test that indexed nodes match find_all for each node type."""
+        sql = """
+        WITH c AS (SELECT a FROM `project.dataset.table` WHERE a > 1)
+        SELECT c.a FROM c JOIN `project.dataset.other` o ON c.a = o.a WHERE o.b = 2
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        index = functions.index_ast(ast)
+
+        for node_type in (exp.Where, exp.Join, exp.From, exp.CTE, exp.Column, exp.Table):
+            assert index.get(node_type, []) == list(ast.find_all(node_type))
+
+    def test_index_includes_subclasses(self):
+        """Test that nodes are indexed under their base classes too."""
+        ast = parse_one("SELECT SAFE_CAST(a AS DATE) FROM t", dialect="bigquery")
+        index = functions.index_ast(ast)
+
+        assert index[exp.Cast] == list(ast.find_all(exp.Cast))
+
+    def test_iter_typed_matches_find_all(self):
+        """Test that the typed walk yields the same nodes in the same order as find_all."""
+        sql = """
+        WITH c AS (SELECT a FROM `project.dataset.table` WHERE a IN (SELECT b FROM d))
+        SELECT * FROM c JOIN (SELECT a FROM e) x USING (a) WHERE x.a > 1
+        """
+        ast = parse_one(sql, dialect="bigquery")
+
+        for types in ((exp.Select,), (exp.Table, exp.Column), (exp.Expression,)):
+            assert list(functions.iter_typed(ast, *types)) == list(ast.find_all(*types))
+
+    def test_is_descendant(self):
+        """Test ancestor detection used to scope indexed nodes."""
+        ast = parse_one("SELECT a FROM t WHERE b = 1", dialect="bigquery")
+        where = ast.args["where"]
+
+        assert functions.is_descendant(where.find(exp.EQ), where)
+        assert not functions.is_descendant(ast.find(exp.From), where)
+
+
+class TestGetTableRefs:
+    """Test resolving the tables referenced by a statement."""
+
+    def test_table_refs_per_clause(self):
+        """Test that FROM and JOIN tables are resolved with their aliases."""
+        sql = """
+        SELECT a FROM `proj.ds.big` b
+        JOIN `proj.ds.other` o ON b.id = o.id
+        JOIN cte ON cte.id = b.id
+        """
+        ast = parse_one(sql, dialect="bigquery")
+        from_refs, join_refs = functions.get_table_refs(ast)
+
+        assert from_refs == [("proj.ds.big", "b")]
+        assert join_refs == [("proj.ds.other", "o")]
+
+    def test_nested_tables_resolved_once(self):
+        """Test that a table in a nested FROM is resolved once, not once per enclosing FROM."""
+        sql = (
+            "SELECT * FROM (SELECT * FROM (SELECT a FROM `proj.ds.big`)) JOIN `proj.ds.o` o ON 1=1"
+        )
+        ast = parse_one(sql, dialect="bigquery")
+        from_refs, join_refs = functions.get_table_refs(ast)
+
+        assert from_refs == [("proj.ds.big", None)]
+        assert join_refs == [("proj.ds.o", "o")]
+
+
+class TestGetClient:
+    """Test BigQuery client reuse."""
+
+    def test_client_reused_per_project(self):
+        """Test that a client is created once per job project."""
+        functions._get_project_client.cache_clear()
+        config = Config.from_env()
+
+        with patch("bq_sql_antipattern_checker.functions.bigquery.Client") as mock_client:
+            first = functions.get_client(config)
+            second = functions.get_client(config)
+
+        assert first is second
+        mock_client.assert_called_once_with(project=config.bigquery_job_project)
+        functions._get_project_client.cache_clear()
+
+
+class TestTableIndex:
+    """Test table name matching against the columns dictionary."""
+
+    columns_dict: ClassVar[dict[str, dict[str, int]]] = {
+        "proj.ds.events_20240101": {"total_rows": 1},
+        "proj.ds.events_20240102": {"total_rows": 1},
+        "proj.ds.other": {"total_rows": 1},
+        "other.ds.events_20240101": {"total_rows": 1},
+    }
+
+    def test_exact_match(self):
+        """Test that exact names only match themselves."""
+        table_index = functions.TableIndex(self.columns_dict)
+
+        assert table_index.match("proj.ds.other") == ["proj.ds.other"]
+        assert table_index.match("proj.ds.missing") == []
+
+    def test_wildcard_match(self):
+        """Test that wildcards match the same tables as a scan of every key."""
+        table_index = functions.TableIndex(self.columns_dict)
+
+        for name in ("proj.ds.events_*", "ds.events_*", "proj.ds.*"):
+            expected = sorted(k for k in self.columns_dict if name.replace("*", "") in k)
+            assert table_index.match(name) == expected
+
+    def test_wildcard_summary(self):
+        """Test that shard row counts are summed once per wildcard reference."""
+        columns_dict = {
+            k: {
+                "total_rows": 10,
+                "partitioned_column": None,
+                "datetime_columns": ["ts"],
+                "table": k.split(".")[-1],
+            }
+            for k in self.columns_dict
+        }
+        table_index = functions.TableIndex(columns_dict)
+
+        with patch.object(
+            functions, "summarize_tables", wraps=functions.summarize_tables
+        ) as mock_summarize:
+            for _ in range(2):
+                summary = table_index.summary("proj.ds.events_*")
+
+        assert summary == (20, None, ["ts"], 1, "events_20240102")
+        assert table_index.summary("proj.ds.missing") is None
+        assert mock_summarize.call_count == 1
+
+    def test_qualified_wildcard_same_with_and_without_index(self):
+        """Test that a qualified wildcard only covers its own project, with or without an index."""
+        columns_dict = {
+            k: {
+                "total_rows": rows,
+                "partitioned_column": "ts",
+                "datetime_columns": ["ts"],
+                "table": k.split(".")[-1],
+            }
+            for k, rows in (("proj.ds.events_1", 1000), ("myproj.ds.events_2", 200))
+        }
+        ast = parse_one("SELECT * FROM `proj.ds.events_*`", dialect="bigquery")
+        table_index = functions.TableIndex(columns_dict)
+
+        queried = [
+            functions.get_queried_tables(ast, columns_dict, 1, index)
+            for index in (None, table_index)
+        ]
+        partitioned = [
+            functions.get_partitioned_tables(ast, columns_dict, index)
+            for index in (None, table_index)
+        ]
+
+        assert queried[0] == queried[1]
+        assert queried[0]["proj.ds.events_*"]["total_rows"] == 1000
+        assert partitioned[0] == partitioned[1]
+        assert list(partitioned[0]) == ["proj.ds.events_*"]
+
+    def test_partitioned_match(self):
+        """Test that only partitioned tables are kept among the matches."""
+        columns_dict = {
+            k: {"partitioned_column": "ts" if k.endswith("0101") else None}
+            for k in self.columns_dict
+        }
+        table_index = functions.TableIndex(columns_dict)
+
+        assert table_index.partitioned_match("proj.ds.events_*") == ["proj.ds.events_20240101"]
+        assert table_index.partitioned_match("proj.ds.other") == []
+
+    def test_statement_tables_cached(self):
+        """Test that jobs with the same table references share their resolved tables."""
+        columns_dict = {
+            "proj.ds.other": {
+                "total_rows": 10,
+                "partitioned_column": "ts",
+                "datetime_columns": ["ts"],
+                "table": "other",
+            }
+        }
+        table_index = functions.TableIndex(columns_dict)
+        asts = [
+            parse_one(sql, dialect="bigquery")
+            for sql in ("SELECT a FROM `proj.ds.other` o", "SELECT b FROM `proj.ds.other` o")
+        ]
+
+        queried = [functions.get_queried_tables(ast, columns_dict, 1, table_index) for ast in asts]
+        partitioned = [
+            functions.get_partitioned_tables(ast, columns_dict, table_index) for ast in asts
+        ]
+
+        assert queried[0] is queried[1]
+        assert set(queried[0]) == {"proj.ds.other", "o"}
+        assert partitioned[0] is partitioned[1]
+        assert partitioned[0]["o"]["partition_column"] == "ts"
+        assert functions.get_queried_tables(asts[0], columns_dict, 100, table_index) == {}
+
+
+class TestIterJobs:
+    """Test streaming job rows from BigQuery."""
+
+    def test_rows_streamed_as_dicts(self):
+        """Test that result rows are yielded lazily as plain dicts, page by page."""
+        config = Config.from_env()
+        rows = [{"job_id": "a", "query": "SELECT 1"}, {"job_id": "b", "query": "SELECT 2"}]
+
+        with patch.object(functions, "get_client") as mock_get_client:
+            mock_result = mock_get_client.return_value.query.return_value.result
+            mock_result.return_value = iter(rows)
+            jobs = functions.iter_jobs(config, None, 1)
+
+            mock_get_client.assert_not_called()
+            assert list(jobs) == rows
+
+        mock_result.assert_called_once_with(page_size=10_000)
+
+
+class TestGetColumnsDict:
+    """Test fetching table metadata for the referenced datasets."""
+
+    def test_referenced_datasets(self):
+        """Test that every qualified table's dataset is collected."""
+        queries = [
+            "SELECT a.x FROM `proj.sales.orders` a JOIN `proj`.`crm`.`users` u ON a.id = u.id",
+            "SELECT * FROM marketing.events_2024",
+        ]
+
+        datasets = functions.get_referenced_datasets(queries)
+
+        assert {"sales", "crm", "marketing"} <= datasets
+        assert "orders" not in datasets
+
+    def test_columns_query_filtered_by_datasets(self):
+        """Test that the dataset filter is passed as a query parameter."""
+        config = Config.from_env()
+
+        with patch.object(functions, "get_client") as mock_get_client:
+            functions.get_columns_dict(config, {"sales", "crm"})
+
+        (query,) = mock_get_client.return_value.query.call_args.args
+        job_config = mock_get_client.return_value.query.call_args.kwargs["job_config"]
+        assert query.count("table_schema in unnest(@datasets)") == 2 * len(
+            config.information_schema_project
+        )
+        assert job_config.query_parameters[0].values == ["crm", "sales"]
+
+    def test_no_datasets_skips_query(self):
+        """Test that no metadata is queried when the jobs reference no datasets."""
+        with patch.object(functions, "get_client") as mock_get_client:
+            assert functions.get_columns_dict(Config.from_env(), set()) == {}
+
+        mock_get_client.assert_not_called()
+
+    def test_columns_dict_built_from_rows(self):
+        """Test that rows are keyed by full table name without a DataFrame."""
+        row = {
+            "project": "proj",
+            "dataset": "sales",
+            "table": "orders",
+            "full_table_name": "proj.sales.orders",
+            "total_rows": 1000,
+            "partitioned_column": "order_date",
+            "datetime_columns": ["order_date"],
+        }
+
+        with patch.object(functions, "get_client") as mock_get_client:
+            mock_query_job = mock_get_client.return_value.query.return_value
+            mock_query_job.result.return_value = iter([row])
+            columns_dict = functions.get_columns_dict(Config.from_env())
+
+        mock_query_job.to_dataframe.assert_not_called()
+        assert columns_dict == {
+            "proj.sales.orders": {k: v for k, v in row.items() if k != "full_table_name"}
+        }
+
+
+class TestPushResultsToBq:
+    """Test uploading results without a DataFrame."""
+
+    def test_results_loaded_as_json(self, job_row):
+        """Test that job results are loaded as JSON rows against the fixed schema."""
+        config = Config.from_env()
+        records = [{"job_id": "job-1", **Job(job_row, Antipatterns(config)).to_dict()}]
+
+        with patch.object(functions, "get_client") as mock_get_client:
+            functions.push_results_to_bq(records, config)
+
+        mock_load = mock_get_client.return_value.load_table_from_json
+        rows, table_id = mock_load.call_args.args
+        job_config = mock_load.call_args.kwargs["job_config"]
+        rows = list(rows)
+        json.dumps(rows)
+        assert table_id.endswith(f".{config.results_table_name}")
+        assert rows[0]["job_id"] == "job-1"
+        assert rows[0]["creation_date"] == "2024-01-02"
+        assert [field.name for field in job_config.schema] == list(rows[0])
+        assert job_config is functions.RESULTS_LOAD_JOB_CONFIG
+        assert not job_config.autodetect
+
+    def test_output_df_columns(self, job_row):
+        """Test that the local output DataFrame has one row per job in schema order."""
+        job = Job(job_row, Antipatterns(Config.from_env()))
+        records = [{"job_id": f"job-{i}", **job.to_dict()} for i in range(2)]
+
+        output_df = functions.get_output_df(records)
+
+        assert list(output_df.columns) == functions.RESULT_COLUMNS
+        assert list(output_df["job_id"]) == ["job-0", "job-1"]
+
+
+class TestTableNames:
+    """Test building table names from AST nodes."""
+
+    def test_table_names_interned(self):
+        """Test that the same table referenced by different statements shares one name string."""
+        names = [
+            functions.get_alias_and_table_name_from_table(
+                parse_one(sql, dialect="bigquery").find(exp.Table)
+            )[0]
+            for sql in ("SELECT a FROM `proj.ds.t`", "SELECT b FROM `proj.ds.t` x")
+        ]
+
+        assert names[0] == "proj.ds.t"
+        assert names[0] is names[1]
+
+    def test_table_alias(self):
+        """Test that the alias is read the same way for qualified and unqualified tables."""
+        sql = "SELECT 1 FROM `proj.ds.t` x JOIN cte c ON 1=1 JOIN u ON 1=1"
+        ast = parse_one(sql, dialect="bigquery")
+
+        assert [functions.get_table_alias(t) for t in ast.find_all(exp.Table)] == ["x", "c", None]
@@ -14,17 +14,18 @@ def jinja_env():
 
 def test_render_with_limit(jinja_env):
     template = jinja_env.get_template("jobs_query.sql.j2")
-    query = template.render(limit_row=10)
-    jobs_query = query.format(
-        query_project="my_project", region="us", date="'2024-06-01'", cumul_perc=1
-    )
+    jobs_query = template.render(jobs_query_raw="SELECT 1", limit_row=10, cumul_perc=1)
     assert "LIMIT 10" in jobs_query
 
 
 def test_render_without_limit(jinja_env):
     template = jinja_env.get_template("jobs_query.sql.j2")
-    query = template.render()
-    jobs_query = query.format(
-        query_project="my_project", region="us", date="'2024-06-01'", cumul_perc=1
-    )
+    jobs_query = template.render(jobs_query_raw="SELECT 1", cumul_perc=1)
     assert "LIMIT 10" not in jobs_query
+
+
+def test_render_jobs_query_raw(jinja_env):
+    template = jinja_env.get_template("jobs_query_raw.sql.j2")
+    query = template.render(query_project="my_project", region="us", date="'2024-06-01'")
+    assert "`my_project.us.INFORMATION_SCHEMA.JOBS`" in query
+    assert "DATE ('2024-06-01')" in query